@@ -0,0 +1,36 @@
+# Generated by Django 6.0.1 on 2026-10-17 11:20
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def populate_storage_used(apps, schema_editor):
+    Profile = apps.get_model("accounts", "Profile")
+    File = apps.get_model("gis_database", "File")
+
+    totals = (
+        File.objects.filter(owner=OuterRef("user"))
+        .order_by()
+        .values("owner")
+        .annotate(total=Sum("size"))
+        .values("total")
+    )
+    Profile.objects.update(storage_used_bytes=Coalesce(Subquery(totals), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_profile_role'),
+        ('gis_database', '0017_project_storage_used_bytes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='storage_used_bytes',
+            field=models.BigIntegerField(default=0, help_text='Running total of the sizes of files this user owns'),
+        ),
+        migrations.RunPython(populate_storage_used, migrations.RunPython.noop),
+    ]
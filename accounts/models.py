@@ -4,8 +4,6 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
 
-from gis_database.models import File
-
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -37,12 +35,15 @@ class Profile(models.Model):
     storage_limit_mb = models.PositiveIntegerField(
         default=20, help_text="Maximum allowed storage for this user in MB"
     )
+    storage_used_bytes = models.BigIntegerField(
+        default=0, help_text="Running total of the sizes of files this user owns"
+    )
 
     def __str__(self):
         return f"{self.user.username}"
 
     def used_storage_bytes(self):
-        return sum(f.file.size for f in File.objects.filter(owner=self.user) if f.file)
+        return self.storage_used_bytes
 
     def remaining_storage_bytes(self):
         return max(
@@ -1,6 +1,7 @@
 from rest_framework import serializers
+from django.urls import reverse
 from django.contrib.auth.models import User
-from gis_database.models import Project, File
+from gis_database.models import Project, File, SpatialData
 from accounts.models import Profile
 
 
@@ -55,8 +56,25 @@ class ProjectSerializer(serializers.ModelSerializer):
         return project
 
 
+class SpatialLayerSerializer(serializers.ModelSerializer):
+    """Stored ingestion summary of one layer; never reads geometry"""
+
+    class Meta:
+        model = SpatialData
+        fields = [
+            "id",
+            "layer_name",
+            "feature_count",
+            "extent",
+            "geometry_types",
+            "attribute_schema",
+            "source_crs",
+        ]
+
+
 class FileSerializer(serializers.ModelSerializer):
     download_url = serializers.SerializerMethodField()
+    layers = SpatialLayerSerializer(source="spatialdata_set", many=True, read_only=True)
 
     class Meta:
         model = File
@@ -64,7 +82,7 @@ class FileSerializer(serializers.ModelSerializer):
 
     def get_download_url(self, obj):
         request = self.context.get("request")
-        return request.build_absolute_uri(f"/api/files/{obj.id}/download/")
+        return request.build_absolute_uri(reverse("file-download", args=[obj.id]))
 
 
 class ProjectWithFilesSerializer(ProjectSerializer):
@@ -1,3 +1,265 @@
-from django.test import TestCase
+import hashlib
+import os
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.contrib.gis.geos import Point
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from gis_database.models import (
+    File,
+    Project,
+    SpatialData,
+    SpatialFeature,
+    UploadSession,
+)
+
+from .views import parse_range
+
+
+class MediaRootMixin:
+    def use_temp_media(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        media_settings = self.settings(
+            MEDIA_ROOT=os.path.join(tmp.name, "media"),
+            UPLOAD_STAGING_DIR=os.path.join(tmp.name, "staging"),
+            FILE_DOWNLOAD_REDIRECT=False,
+        )
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_closed_range(self):
+        self.assertEqual(parse_range("bytes=0-99", 1000), (0, 99))
+
+    def test_open_ended_range_runs_to_the_end(self):
+        self.assertEqual(parse_range("bytes=500-", 1000), (500, 999))
+
+    def test_end_past_size_is_clamped(self):
+        self.assertEqual(parse_range("bytes=900-5000", 1000), (900, 999))
+
+    def test_suffix_range(self):
+        self.assertEqual(parse_range("bytes=-100", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=-5000", 1000), (0, 999))
+
+    def test_unsatisfiable_ranges(self):
+        self.assertEqual(parse_range("bytes=1000-", 1000), "invalid")
+        self.assertEqual(parse_range("bytes=50-10", 1000), "invalid")
+
+    def test_ignored_ranges_send_the_whole_file(self):
+        self.assertIsNone(parse_range("bytes=0-1,5-9", 1000))
+        self.assertIsNone(parse_range("items=0-10", 1000))
+        self.assertIsNone(parse_range("bytes=-", 1000))
+
+
+class FileDownloadTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        self.use_temp_media()
+        self.user = User.objects.create_user("owner", password="secret-pass-123")
+        self.project = Project.objects.create(name="downloads", owner=self.user)
+        self.data = bytes(range(256)) * 8
+        self.file = File.objects.create(
+            project=self.project,
+            owner=self.user,
+            name="table.csv",
+            file=ContentFile(self.data, name="table.csv"),
+            hash=hashlib.sha256(self.data).hexdigest(),
+            version=1,
+            is_latest=True,
+        )
+        self.url = reverse("file-download", args=[self.file.pk])
+        self.client.force_login(self.user)
+
+    def body(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_whole_file(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.data)
+        self.assertEqual(response["ETag"], f'"{self.file.hash}"')
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+    def test_range(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=100-199")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(self.body(response), self.data[100:200])
+        self.assertEqual(
+            response["Content-Range"], f"bytes 100-199/{len(self.data)}"
+        )
+        self.assertEqual(response["Content-Length"], "100")
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE=f"bytes={len(self.data)}-")
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.data)}")
+
+    def test_stale_if_range_sends_the_whole_file(self):
+        response = self.client.get(
+            self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"outdated"'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.data)
+
+    def test_if_none_match(self):
+        etag = f'"{self.file.hash}"'
+        for header in [etag, f'"other", W/{etag}', "*"]:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=header)
+            self.assertEqual(response.status_code, 304, header)
+            self.assertEqual(response["ETag"], etag)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_other_users_and_deleted_projects_get_404(self):
+        other = User.objects.create_user("other", password="secret-pass-123")
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+        self.client.force_login(self.user)
+        self.project.soft_delete()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+class UploadSessionAPITests(MediaRootMixin, TestCase):
+    def setUp(self):
+        self.use_temp_media()
+        self.user = User.objects.create_user("owner", password="secret-pass-123")
+        self.project = Project.objects.create(name="uploads", owner=self.user)
+        self.client.force_login(self.user)
+        self.data = b"id,name\n1,a\n2,b\n"
+
+        response = self.client.post(
+            reverse("upload-list"),
+            {
+                "project": self.project.pk,
+                "filename": "rows.csv",
+                "size": len(self.data),
+            },
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.session_id = response.json()["id"]
+        self.url = reverse("upload-detail", args=[self.session_id])
+
+    def put_chunk(self, offset, chunk):
+        return self.client.put(
+            self.url,
+            chunk,
+            content_type="application/octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def complete(self):
+        return self.client.post(reverse("upload-complete", args=[self.session_id]))
+
+    def test_upload_in_chunks(self):
+        self.assertEqual(self.put_chunk(0, self.data[:5]).json()["offset"], 5)
+        self.assertEqual(self.put_chunk(5, self.data[5:]).json()["offset"], 17)
+
+        response = self.complete()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            response.json()["hash"], hashlib.sha256(self.data).hexdigest()
+        )
+
+    def test_wrong_offset_is_409_with_resume_offset(self):
+        self.put_chunk(0, self.data[:5])
+
+        response = self.put_chunk(9, self.data[9:])
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["offset"], 5)
+
+    def test_missing_offset_header_is_400(self):
+        response = self.client.put(
+            self.url, self.data, content_type="application/octet-stream"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_incomplete_upload_is_400(self):
+        self.put_chunk(0, self.data[:5])
+        self.assertEqual(self.complete().status_code, 400)
+
+    def test_lost_staging_is_410(self):
+        self.put_chunk(0, self.data[:5])
+        os.remove(UploadSession.objects.get(pk=self.session_id).staging_path)
+
+        self.assertEqual(self.put_chunk(5, self.data[5:]).status_code, 410)
+        self.assertEqual(self.complete().status_code, 400)
+
+    def test_other_users_sessions_are_404(self):
+        other = User.objects.create_user("other", password="secret-pass-123")
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+class FeaturePaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="secret-pass-123")
+        self.project = Project.objects.create(name="features", owner=self.user)
+        self.client.force_login(self.user)
+
+        source = File.objects.create(
+            project=self.project,
+            owner=self.user,
+            name="points.csv",
+            file="uploads/points.csv",
+            hash="points",
+            version=1,
+            is_latest=True,
+        )
+        layer = SpatialData.objects.create(project=self.project, source_file=source)
+        SpatialFeature.objects.bulk_create(
+            SpatialFeature(
+                spatial_data=layer,
+                project=self.project,
+                feature_index=i,
+                geometry=Point(120 + i * 0.01, 14, srid=4326),
+                properties={"n": i},
+            )
+            for i in range(25)
+        )
+        self.url = reverse("project-features", args=[self.project.pk])
+
+    def test_pages_cover_every_feature_once(self):
+        seen = []
+        url = f"{self.url}?limit=10"
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            seen += [feature["properties"]["n"] for feature in body["features"]]
+            url = body["next"]
+            pages += 1
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, list(range(25)))
+
+    def test_next_link_keeps_filters(self):
+        response = self.client.get(self.url, {"limit": 5, "bbox": "119,13,121,15"})
+        next_url = response.json()["next"]
+
+        self.assertIn("bbox=119%2C13%2C121%2C15", next_url)
+        self.assertIn("limit=5", next_url)
+        self.assertIn(f"after={response.json()['features'][-1]['id']}", next_url)
+
+    def test_last_page_has_no_next(self):
+        response = self.client.get(self.url, {"limit": 25})
+
+        self.assertEqual(len(response.json()["features"]), 25)
+        self.assertIsNone(response.json()["next"])
+
+    def test_invalid_paging_parameters_are_400(self):
+        self.assertEqual(self.client.get(self.url, {"after": "x"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"limit": "x"}).status_code, 400)
@@ -1,7 +1,9 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
+    FileDownloadView,
     ProjectViewSet,
+    UploadSessionViewSet,
     LoginView,
     LogoutView,
     UserProfileView,
@@ -9,10 +11,14 @@ from .views import (
 
 router = DefaultRouter()
 router.register(r"projects", ProjectViewSet, basename="project")
+router.register(r"uploads", UploadSessionViewSet, basename="upload")
 
 urlpatterns = [
     path("", include(router.urls)),
     path("login/", LoginView.as_view(), name="api-login"),
     path("logout/", LogoutView.as_view(), name="api-logout"),
     path("user-profile/", UserProfileView.as_view(), name="user-profile"),
+    path(
+        "files/<int:pk>/download/", FileDownloadView.as_view(), name="file-download"
+    ),
 ]
\ No newline at end of file
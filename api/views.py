@@ -1,3 +1,7 @@
+import json
+import mimetypes
+import re
+
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser, FormParser
@@ -5,17 +9,46 @@ from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 from rest_framework.views import APIView
 
+from django.conf import settings
 from django.contrib.auth import authenticate
-from django.http import FileResponse, Http404
-from django.db import transaction
+from django.core.exceptions import ValidationError
+from django.contrib.gis.db.models.functions import AsGeoJSON
+from django.contrib.gis.geos import GEOSGeometry, GEOSException
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
 
-from gis_database.models import Project, File
+from gis_database.models import Project, File, SpatialFeature, UploadSession
 from .serializers import (
     ProjectSerializer,
     UserSerializer,
     ProjectWithFilesSerializer,
 )
 
+from gis_database.services.chunked_upload import (
+    StagingLost,
+    UploadOffsetMismatch,
+    append_chunk,
+    complete_upload,
+    start_upload,
+)
+from gis_database.services.clusters import file_clusters
+from gis_database.services.presigned_upload import (
+    finalize_presigned_upload,
+    start_presigned_upload,
+)
+from gis_database.services.file_versions import create_file_version
+from gis_database.services.object_storage import (
+    iter_stored,
+    presigned_get,
+    supports_presigned,
+)
+from gis_database.services.simplify import level_for_zoom
 from gis_database.utils import compute_hash
 
 # -------------------- AUTHENTICATION --------------------
@@ -112,6 +145,110 @@ class UserProfileView(APIView):
         return Response(serializer.data)
 
 
+# -------------------- FILE DOWNLOAD --------------------
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header, size):
+    """
+    (start, end) of a single-range `Range` header, None to send the whole
+    file (absent or multi-range), or "invalid" when it can't be satisfied.
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        # Suffix range: the final N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        return None
+
+    if start > end or start >= size:
+        return "invalid"
+    return start, end
+
+
+class FileDownloadView(APIView):
+    """
+    ## GET /api/v1/files/{id}/download/
+
+    Downloads a file version.
+
+    - `Range: bytes=start-end` returns `206 Partial Content` (single ranges)
+    - `ETag` is the file's SHA-256; `If-None-Match` returns `304 Not Modified`
+    - With `FILE_DOWNLOAD_REDIRECT`, answers `302` to a short-lived presigned
+      object storage URL, which supports ranges itself
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        file = File.objects.filter(
+            pk=pk, project__in=Project.objects.visible_to(request.user)
+        ).first()
+        if file is None or not file.file:
+            raise Http404("File not found.")
+
+        etag = f'"{file.hash}"'
+        if_none_match = request.headers.get("If-None-Match", "")
+        if if_none_match.strip() == "*" or etag in [
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        ]:
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
+
+        storage = file.file.storage
+        filename = file.name or file.file.name.rsplit("/", 1)[-1]
+
+        if settings.FILE_DOWNLOAD_REDIRECT and supports_presigned(storage):
+            return HttpResponseRedirect(
+                presigned_get(
+                    storage,
+                    file.file.name,
+                    settings.FILE_DOWNLOAD_URL_EXPIRES,
+                    filename=filename,
+                )
+            )
+
+        size = file.size or storage.size(file.file.name)
+        byte_range = None
+        if "Range" in request.headers and request.headers.get("If-Range", etag) == etag:
+            byte_range = parse_range(request.headers["Range"], size)
+
+        if byte_range == "invalid":
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        if byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                iter_stored(storage, file.file.name, start=start, end=end),
+                status=206,
+            )
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+            response["Content-Length"] = end - start + 1
+        else:
+            response = StreamingHttpResponse(iter_stored(storage, file.file.name))
+            response["Content-Length"] = size
+
+        response["Content-Type"] = (
+            mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response["Accept-Ranges"] = "bytes"
+        response["ETag"] = etag
+        return response
+
+
 # -------------------- PROJECT CRUD + VERSIONING --------------------
 
 
@@ -138,14 +275,27 @@ class ProjectViewSet(viewsets.ModelViewSet):
     | POST   | /projects/{id}/files/upload/ | Upload a new file version |
     | GET    | /projects/{id}/files/ | List latest files |
     | GET    | /projects/{id}/versions/ | List all file versions |
+
+    ## Features
+
+    | Method | URL | Description |
+    |--------|-----|-------------|
+    | GET    | /projects/{id}/features/ | Features in an area (GeoJSON) |
+    | GET    | /projects/{id}/clusters/ | Point clusters of a file (GeoJSON) |
     """
 
+    FEATURES_DEFAULT_LIMIT = 100
+    FEATURES_MAX_LIMIT = 1000
+
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         """Only return projects for the authenticated user."""
-        return Project.objects.filter(owner=self.request.user)
+        queryset = Project.objects.filter(owner=self.request.user)
+        if self.action in ["list", "retrieve"]:
+            queryset = queryset.prefetch_related("files__spatialdata_set")
+        return queryset
 
     def get_serializer_class(self):
         """Use ProjectWithFilesSerializers for list/retrieve to include latest files"""
@@ -168,39 +318,325 @@ class ProjectViewSet(viewsets.ModelViewSet):
             return Response({"error": "file required"}, status=400)
 
         file_hash = compute_hash(uploaded_file)
-        
-        uploaded_file.seek(0)
-        existing = project.files.filter(hash=file_hash).first()
+        new_file, created = create_file_version(
+            project, request.user, uploaded_file, file_hash
+        )
 
-        if existing:
+        if not created:
             return Response(
-                {"detail": "File already exists", "file_id": existing.id}, status=200
+                {"detail": "File already exists", "file_id": new_file.id}, status=200
             )
 
-        # Versioning
-        latest = (
-            project.files.filter(name=uploaded_file.name).order_by("-version").first()
+        return Response(
+            {
+                "id": new_file.id,
+                "version": new_file.version,
+                "hash": new_file.hash,
+            },
+            status=201,
         )
-        next_version = (latest.version + 1) if latest else 1
-
-        with transaction.atomic():
-            project.files.filter(name=uploaded_file.name).update(is_latest=False)
-
-            new_file = File.objects.create(
-                project=project,
-                owner=request.user,
-                file=uploaded_file,
-                name=uploaded_file.name,
-                version=next_version,
-                hash=file_hash,
-                is_latest=True,
-            )
 
+    # -------------------- Spatial Query --------------------
+    @action(detail=True, methods=["get"], url_path="features")
+    def features(self, request, pk=None):
+        """
+        ## GET /api/v1/projects/{id}/features/
+
+        Features of the project's latest files as a GeoJSON FeatureCollection,
+        filtered with the spatial index. Coordinates are WGS84 (EPSG:4326).
+
+        **Query Parameters:**
+        - `bbox` - `minx,miny,maxx,maxy`
+        - `intersects` - WKT geometry the features must intersect
+        - `file_id` - only this file (any version)
+        - `zoom` - map zoom; serves geometry simplified for that zoom
+        - `limit` - page size (default 100, max 1000)
+        - `after` - feature id to continue after (from `next`)
+
+        **Response:**
+        ```json
+        {
+            "type": "FeatureCollection",
+            "features": [{"type": "Feature", "id": int, "geometry": {}, "properties": {}}],
+            "next": "string | null"
+        }
+        ```
+        """
+        project = self.get_object()
+        params = request.query_params
+
+        features = SpatialFeature.objects.filter(project=project)
+        if params.get("file_id"):
+            if not params["file_id"].isdigit():
+                return Response({"error": "file_id must be an integer"}, status=400)
+            features = features.filter(spatial_data__source_file_id=params["file_id"])
+        else:
+            features = features.filter(spatial_data__source_file__is_latest=True)
+
+        if params.get("bbox"):
+            try:
+                minx, miny, maxx, maxy = map(float, params["bbox"].split(","))
+            except ValueError:
+                return Response(
+                    {"error": "bbox must be minx,miny,maxx,maxy"}, status=400
+                )
+            features = features.in_bbox(minx, miny, maxx, maxy)
+
+        if params.get("intersects"):
+            try:
+                geometry = GEOSGeometry(params["intersects"], srid=4326)
+            except (GEOSException, ValueError):
+                return Response({"error": "intersects must be WKT"}, status=400)
+            features = features.intersecting(geometry)
+
+        try:
+            limit = int(params.get("limit", self.FEATURES_DEFAULT_LIMIT))
+            after = int(params.get("after", 0))
+            zoom = int(params["zoom"]) if params.get("zoom") else None
+        except ValueError:
             return Response(
+                {"error": "limit, after and zoom must be integers"}, status=400
+            )
+        limit = max(1, min(limit, self.FEATURES_MAX_LIMIT))
+
+        # Keyset pagination: stable under concurrent inserts, no OFFSET scans
+        rows = list(
+            features.filter(id__gt=after)
+            .order_by("id")
+            .at_level(level_for_zoom(zoom))
+            .annotate(geojson=AsGeoJSON("display_geometry"))
+            .values_list("id", "geojson", "properties")[: limit + 1]
+        )
+
+        next_url = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            query = params.copy()
+            query["after"] = rows[-1][0]
+            next_url = request.build_absolute_uri(
+                f"{request.path}?{query.urlencode()}"
+            )
+
+        return Response(
+            {
+                "type": "FeatureCollection",
+                "features": [
+                    {
+                        "type": "Feature",
+                        "id": feature_id,
+                        "geometry": json.loads(geojson),
+                        "properties": properties or {},
+                    }
+                    for feature_id, geojson, properties in rows
+                ],
+                "next": next_url,
+            }
+        )
+
+    @action(detail=True, methods=["get"], url_path="clusters")
+    def clusters(self, request, pk=None):
+        """
+        ## GET /api/v1/projects/{id}/clusters/
+
+        Grid clusters of a file's point features for a map view, computed in
+        PostGIS and cached per file version.
+
+        **Query Parameters:**
+        - `file_id` - the point file (required)
+        - `zoom` - map zoom level (required)
+        - `bbox` - `minx,miny,maxx,maxy` of the view (required)
+
+        **Response:**
+        ```json
+        {
+            "type": "FeatureCollection",
+            "features": [
                 {
-                    "id": new_file.id,
-                    "version": new_file.version,
-                    "hash": new_file.hash,
-                },
-                status=201,
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                    "properties": {"count": int, "feature_id": "int | null"}
+                }
+            ]
+        }
+        ```
+        """
+        project = self.get_object()
+        params = request.query_params
+
+        try:
+            file_id = int(params["file_id"])
+            zoom = int(params["zoom"])
+            bbox = [float(v) for v in params["bbox"].split(",")]
+        except (KeyError, ValueError):
+            return Response(
+                {"error": "file_id, zoom and bbox=minx,miny,maxx,maxy required"},
+                status=400,
+            )
+        if len(bbox) != 4:
+            return Response({"error": "bbox must be minx,miny,maxx,maxy"}, status=400)
+
+        file = project.files.filter(pk=file_id).first()
+        if file is None:
+            raise Http404("File not found.")
+
+        try:
+            return Response(file_clusters(file, zoom, bbox))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+
+# -------------------- CHUNKED UPLOADS --------------------
+
+
+class UploadSessionViewSet(viewsets.ViewSet):
+    """
+    # Resumable Upload API Endpoints
+
+    Uploads a file in ordered chunks; a dropped connection only loses the
+    chunk in flight. The file is hashed and written to storage once, on
+    completion.
+
+    | Method | URL | Description |
+    |--------|-----|-------------|
+    | POST   | /uploads/ | Start an upload: `{"project": id, "filename": str, "size": int}` |
+    | GET    | /uploads/{id}/ | Current offset, to resume after a failure |
+    | PUT    | /uploads/{id}/ | Append a chunk; raw body, `Upload-Offset` header |
+    | POST   | /uploads/{id}/complete/ | Store the file as a new version |
+    | POST   | /uploads/presigned/ | Start a direct-to-storage upload |
+
+    A PUT whose `Upload-Offset` is not the current offset gets `409 Conflict`
+    with the offset to resume from; `410 Gone` means the staged bytes were
+    lost and the upload has to start over.
+
+    ## Direct Uploads
+
+    `POST /uploads/presigned/` takes the same body plus the file's `sha256`
+    (hex) and returns `upload_url` and `upload_headers`. The client PUTs the
+    whole file there with those headers (straight to object storage, which
+    verifies the checksum), then calls `complete/`, which checks size and
+    hash before creating the file version.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_session(self, pk):
+        try:
+            return UploadSession.objects.get(pk=pk, owner=self.request.user)
+        except (UploadSession.DoesNotExist, ValueError, ValidationError):
+            raise Http404("Upload not found.")
+
+    def upload_target(self, request):
+        """(project, filename, size) from the body of an upload start"""
+        try:
+            project = Project.objects.get(
+                pk=int(request.data["project"]), owner=request.user
+            )
+        except Project.DoesNotExist:
+            raise Http404("Project not found.")
+        return project, str(request.data["filename"]), int(request.data["size"])
+
+    def session_data(self, session):
+        return {
+            "id": str(session.id),
+            "filename": session.filename,
+            "size": session.size,
+            "offset": session.offset,
+            "status": session.status,
+            "chunk_size": settings.UPLOAD_CHUNK_MAX_BYTES,
+        }
+
+    def create(self, request):
+        try:
+            project, filename, size = self.upload_target(request)
+        except (KeyError, ValueError, TypeError):
+            return Response(
+                {"error": "project, filename and size are required"}, status=400
             )
+
+        try:
+            session = start_upload(project, request.user, filename, size)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+        return Response(self.session_data(session), status=201)
+
+    @action(detail=False, methods=["post"])
+    def presigned(self, request):
+        try:
+            project, filename, size = self.upload_target(request)
+        except (KeyError, ValueError, TypeError):
+            return Response(
+                {"error": "project, filename and size are required"}, status=400
+            )
+
+        try:
+            session, url, headers = start_presigned_upload(
+                project,
+                request.user,
+                filename,
+                size,
+                str(request.data.get("sha256", "")),
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+        return Response(
+            {
+                **self.session_data(session),
+                "upload_url": url,
+                "upload_method": "PUT",
+                "upload_headers": headers,
+            },
+            status=201,
+        )
+
+    def retrieve(self, request, pk=None):
+        return Response(self.session_data(self.get_session(pk)))
+
+    def update(self, request, pk=None):
+        session = self.get_session(pk)
+        if session.object_name:
+            return Response(
+                {"error": "Direct uploads go to upload_url, not here"}, status=400
+            )
+
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.META["CONTENT_LENGTH"])
+        except (KeyError, ValueError):
+            return Response(
+                {"error": "Upload-Offset and Content-Length headers required"},
+                status=400,
+            )
+
+        try:
+            session = append_chunk(session.pk, offset, request.stream, length)
+        except UploadOffsetMismatch as e:
+            return Response({"error": str(e), "offset": e.expected}, status=409)
+        except StagingLost as e:
+            return Response({"error": str(e)}, status=410)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+        return Response(self.session_data(session))
+
+    @action(detail=True, methods=["post"])
+    def complete(self, request, pk=None):
+        session = self.get_session(pk)
+
+        finalize = finalize_presigned_upload if session.object_name else complete_upload
+        try:
+            file, created = finalize(session.pk)
+        except StagingLost as e:
+            return Response({"error": str(e)}, status=410)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+        if not created:
+            return Response(
+                {"detail": "File already exists", "file_id": file.id}, status=200
+            )
+
+        return Response(
+            {"id": file.id, "version": file.version, "hash": file.hash}, status=201
+        )
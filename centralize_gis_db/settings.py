@@ -264,9 +264,22 @@ if IS_PROD:
     MEDIA_URL = f"{AWS_S3_ENDPOINT_URL}/{AWS_STORAGE_BUCKET_NAME}/media/"
     STATIC_URL = f"{AWS_S3_ENDPOINT_URL}/{AWS_STORAGE_BUCKET_NAME}/static/"
 
+    # Local read-through disk cache in front of B2 for File reads
+    STORAGE_CACHE_ENABLED = os.getenv("STORAGE_CACHE_ENABLED", "True").lower() == "true"
+    STORAGE_CACHE_DIR = Path(
+        os.getenv("STORAGE_CACHE_DIR", BASE_DIR / "cache" / "storage")
+    )
+    STORAGE_CACHE_MAX_BYTES = int(
+        os.getenv("STORAGE_CACHE_MAX_BYTES", 2 * 1024 * 1024 * 1024)
+    )
+
     STORAGES = {
         "default": {
-            "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
+            "BACKEND": (
+                "gis_database.storage.CachedS3Storage"
+                if STORAGE_CACHE_ENABLED
+                else "storages.backends.s3boto3.S3Boto3Storage"
+            ),
             "OPTIONS": {
                 "querystring_auth": False,
                 "default_acl": "public-read",
@@ -349,6 +362,91 @@ REST_FRAMEWORK = {
 }
 
 
+# ----------------------------
+# SPATIAL INGESTION
+# ----------------------------
+# Features read, reprojected and written per batch; bounds ingest memory
+SPATIAL_INGEST_BATCH_SIZE = int(os.getenv("SPATIAL_INGEST_BATCH_SIZE", 5000))
+# "copy" streams batches with binary COPY (PostgreSQL only), "orm" uses bulk_create
+SPATIAL_INGEST_LOADER = os.getenv("SPATIAL_INGEST_LOADER", "copy")
+# Processes reading/encoding layers and feature ranges in parallel (1 = inline)
+SPATIAL_INGEST_WORKERS = int(os.getenv("SPATIAL_INGEST_WORKERS", 1))
+
+# ST_SimplifyPreserveTopology tolerances (degrees) stored after ingestion,
+# coarsest first; tiles/GeoJSON pick the coarsest one below a pixel at the zoom
+SPATIAL_SIMPLIFY_TOLERANCES = [
+    float(t)
+    for t in os.getenv("SPATIAL_SIMPLIFY_TOLERANCES", "0.01,0.001,0.0001").split(",")
+    if t
+]
+
+# Job queue drained by `manage.py run_ingestion_worker`
+INGESTION_MAX_ATTEMPTS = int(os.getenv("INGESTION_MAX_ATTEMPTS", 3))
+INGESTION_POLL_INTERVAL = float(os.getenv("INGESTION_POLL_INTERVAL", 5))
+# Running jobs older than this (seconds) are assumed dead and re-claimed
+INGESTION_JOB_TIMEOUT = int(os.getenv("INGESTION_JOB_TIMEOUT", 3600))
+
+
+# ----------------------------
+# UPLOADS
+# ----------------------------
+# Same as Django's defaults, but the SHA-256 is computed while receiving
+FILE_UPLOAD_HANDLERS = [
+    "gis_database.upload_handlers.HashingMemoryFileUploadHandler",
+    "gis_database.upload_handlers.HashingTemporaryFileUploadHandler",
+]
+
+# Chunked uploads: local directory holding partial files until they complete
+UPLOAD_STAGING_DIR = Path(
+    os.getenv("UPLOAD_STAGING_DIR", BASE_DIR / "uploads" / "staging")
+)
+UPLOAD_CHUNK_MAX_BYTES = int(os.getenv("UPLOAD_CHUNK_MAX_BYTES", 16 * 1024 * 1024))
+# Open sessions untouched for this many hours are removed by
+# `manage.py cleanup_upload_sessions`
+UPLOAD_SESSION_TTL_HOURS = int(os.getenv("UPLOAD_SESSION_TTL_HOURS", 24))
+# Lifetime (seconds) of presigned direct-to-storage upload URLs
+PRESIGNED_UPLOAD_EXPIRES = int(os.getenv("PRESIGNED_UPLOAD_EXPIRES", 3600))
+
+# ----------------------------
+# STORAGE CLEANUP
+# ----------------------------
+# Objects of deleted files, removed by `manage.py run_storage_cleanup_worker`
+STORAGE_DELETE_BATCH_SIZE = int(os.getenv("STORAGE_DELETE_BATCH_SIZE", 1000))
+STORAGE_DELETE_MAX_ATTEMPTS = int(os.getenv("STORAGE_DELETE_MAX_ATTEMPTS", 5))
+STORAGE_DELETE_POLL_INTERVAL = float(os.getenv("STORAGE_DELETE_POLL_INTERVAL", 10))
+
+# ----------------------------
+# PROJECT EXPORT
+# ----------------------------
+# Storage objects fetched ahead of the one being written into a ZIP export
+EXPORT_PREFETCH_WORKERS = int(os.getenv("EXPORT_PREFETCH_WORKERS", 4))
+# Cap on prefetched bytes held in memory per export; larger files stream
+EXPORT_PREFETCH_MAX_BYTES = int(
+    os.getenv("EXPORT_PREFETCH_MAX_BYTES", 64 * 1024 * 1024)
+)
+
+# ----------------------------
+# FILE DOWNLOADS
+# ----------------------------
+# Redirect /api/v1/files/<id>/download/ to a presigned object storage URL
+# instead of streaming through the app (object storage only)
+FILE_DOWNLOAD_REDIRECT = (
+    os.getenv("FILE_DOWNLOAD_REDIRECT", str(IS_PROD)).strip().lower() == "true"
+)
+FILE_DOWNLOAD_URL_EXPIRES = int(os.getenv("FILE_DOWNLOAD_URL_EXPIRES", 300))
+
+# ----------------------------
+# RENDER CACHE
+# ----------------------------
+# Rendered map payloads keyed by file hash; "filesystem", "django" or "none"
+RENDER_CACHE_BACKEND = os.getenv("RENDER_CACHE_BACKEND", "filesystem")
+RENDER_CACHE_DIR = Path(os.getenv("RENDER_CACHE_DIR", BASE_DIR / "cache" / "render"))
+# Cache alias used by the "django" backend
+RENDER_CACHE_ALIAS = os.getenv("RENDER_CACHE_ALIAS", "default")
+# Least recently used payloads are evicted past this size (filesystem backend)
+RENDER_CACHE_MAX_BYTES = int(os.getenv("RENDER_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+
 # ----------------------------
 # LOGGING (Add this to the end)
 # ----------------------------
@@ -1,5 +1,13 @@
 from django.contrib import admin
-from .models import Project, File, FileActivity, SpatialData
+from .models import (
+    Project,
+    File,
+    FileActivity,
+    SpatialData,
+    SpatialFeature,
+    IngestionJob,
+    PendingObjectDeletion,
+)
 
 
 # Inline for Files under a Project
@@ -40,11 +48,32 @@ class FileActivityAdmin(admin.ModelAdmin):
     list_filter = ("action", "created_at")
 
 
+@admin.register(IngestionJob)
+class IngestionJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "file", "status", "attempts", "started_at", "finished_at")
+    list_filter = ("status",)
+    readonly_fields = ("error", "created_at", "started_at", "finished_at")
+
+
+@admin.register(PendingObjectDeletion)
+class PendingObjectDeletionAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "attempts", "created_at", "available_at")
+    search_fields = ("name",)
+    readonly_fields = ("error", "created_at")
+
+
 @admin.register(SpatialData)
 class SpatialDataAdmin(admin.ModelAdmin):
     list_display = ("id", "project", "source_file", "created_at")
     list_filter = ("project", "source_file")
 
+
+@admin.register(SpatialFeature)
+class SpatialFeatureAdmin(admin.ModelAdmin):
+    list_display = ("id", "spatial_data", "feature_index", "project")
+    list_filter = ("project",)
+    raw_id_fields = ("spatial_data",)
+
     gis_widget_kwargs = {
         'attrs': {
             'default_zoom': 4,
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from gis_database.models import File
+from gis_database.services.simplify import build_simplified_features
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the zoom-level simplification pyramid of ingested files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project",
+            type=int,
+            help="Only rebuild files of this project.",
+        )
+
+    def handle(self, *args, **options):
+        files = File.objects.filter(spatialdata__isnull=False).distinct()
+        if options["project"]:
+            files = files.filter(project_id=options["project"])
+
+        total = 0
+        for file in files.iterator():
+            total += build_simplified_features(file)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{total} simplified geometries stored")
+        )
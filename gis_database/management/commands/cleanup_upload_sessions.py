@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from gis_database.models import UploadSession
+from gis_database.services.chunked_upload import discard_staging
+
+
+class Command(BaseCommand):
+    help = "Deletes abandoned chunked uploads and their staged bytes."
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS)
+        stale = UploadSession.objects.filter(status="open", updated_at__lt=cutoff)
+
+        count = 0
+        for session in stale.iterator():
+            discard_staging(session)
+            # Direct uploads that were sent but never completed
+            if session.object_name and default_storage.exists(session.object_name):
+                default_storage.delete(session.object_name)
+            session.delete()
+            count += 1
+
+        # Completed sessions only point at their File; keep a short history
+        UploadSession.objects.filter(status="complete", updated_at__lt=cutoff).delete()
+
+        self.stdout.write(self.style.SUCCESS(f"{count} abandoned upload(s) removed"))
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from accounts.models import Profile
+from gis_database.models import Project, File
+
+
+def size_total(field, outer):
+    """Subquery summing File.size per `field`; never asks the storage backend"""
+    return Coalesce(
+        Subquery(
+            File.objects.filter(**{field: OuterRef(outer)})
+            .order_by()
+            .values(field)
+            .annotate(total=Sum("size"))
+            .values("total")
+        ),
+        0,
+    )
+
+
+class Command(BaseCommand):
+    help = "Recomputes Project/Profile storage_used_bytes from File.size."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted counters without fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        targets = [
+            (Project, size_total("project", "pk")),
+            (Profile, size_total("owner", "user")),
+        ]
+
+        for model, total in targets:
+            drifted = [
+                obj
+                for obj in model.objects.annotate(actual=total).only(
+                    "pk", "storage_used_bytes"
+                )
+                if obj.storage_used_bytes != obj.actual
+            ]
+
+            for obj in drifted:
+                self.stdout.write(
+                    f"{model.__name__} {obj.pk}: "
+                    f"{obj.storage_used_bytes} -> {obj.actual} bytes"
+                )
+                obj.storage_used_bytes = obj.actual
+
+            if not options["dry_run"]:
+                model.objects.bulk_update(
+                    drifted, ["storage_used_bytes"], batch_size=500
+                )
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{model.__name__}: {len(drifted)} counter(s) drifted"
+                )
+            )
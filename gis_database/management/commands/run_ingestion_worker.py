@@ -0,0 +1,49 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from gis_database.services.ingestion_jobs import claim_next_job, run_job
+
+
+class Command(BaseCommand):
+    help = "Drains the spatial ingestion job queue. Run several for parallelism."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling for new jobs.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.INGESTION_POLL_INTERVAL,
+            help="Seconds to wait between polls when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Ingestion worker started")
+
+        while True:
+            close_old_connections()
+            job = claim_next_job()
+
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+
+            self.stdout.write(
+                f"Job {job.pk}: ingesting {job.file} (attempt {job.attempts})"
+            )
+            run_job(job)
+
+            if job.status == "done":
+                self.stdout.write(self.style.SUCCESS(f"Job {job.pk}: done"))
+            else:
+                self.stdout.write(
+                    self.style.ERROR(f"Job {job.pk}: {job.status}\n{job.error}")
+                )
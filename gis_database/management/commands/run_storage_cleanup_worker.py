@@ -0,0 +1,39 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from gis_database.services.object_deletion import drain_deletions
+
+
+class Command(BaseCommand):
+    help = "Deletes storage objects of deleted files in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.STORAGE_DELETE_POLL_INTERVAL,
+            help="Seconds to wait between polls when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Storage cleanup worker started")
+
+        while True:
+            close_old_connections()
+            deleted, failed = drain_deletions()
+
+            if deleted or failed:
+                self.stdout.write(f"Deleted {deleted} object(s), {failed} to retry")
+                continue
+
+            if options["once"]:
+                break
+            time.sleep(options["poll_interval"])
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+
+from gis_database.models import File
+from gis_database.services.render_cache import (
+    RENDERERS,
+    cached_render,
+    get_render_cache,
+)
+
+
+class Command(BaseCommand):
+    help = "Pre-renders cached map payloads for ingested files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project",
+            type=int,
+            help="Only warm files of this project.",
+        )
+        parser.add_argument(
+            "--all-versions",
+            action="store_true",
+            help="Include superseded versions, not just the latest ones.",
+        )
+        parser.add_argument(
+            "--format",
+            action="append",
+            choices=sorted({fmt for fmt, _ in RENDERERS}),
+            help="Payload format to render (repeatable); defaults to all.",
+        )
+
+    def handle(self, *args, **options):
+        files = File.objects.filter(spatialdata__isnull=False).distinct()
+        if options["project"]:
+            files = files.filter(project_id=options["project"])
+        if not options["all_versions"]:
+            files = files.filter(is_latest=True)
+
+        formats = options["format"]
+        targets = [
+            (fmt, detail)
+            for fmt, detail in RENDERERS
+            if not formats or fmt in formats
+        ]
+
+        cache = get_render_cache()
+        rendered = 0
+        seen = set()
+
+        # Versions sharing a hash share entries; render each hash once
+        for file in files.only("pk", "hash", "name").iterator():
+            if file.hash in seen:
+                continue
+            seen.add(file.hash)
+
+            for fmt, detail in targets:
+                if cache.get(file.hash, fmt, detail) is None:
+                    cached_render(file, fmt, detail, cache=cache)
+                    rendered += 1
+
+            self.stdout.write(f"{file.name} ({file.hash[:12]})")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(seen)} file(s) warmed, {rendered} payload(s) rendered"
+            )
+        )
@@ -0,0 +1,77 @@
+# Generated by Django 6.0.1 on 2026-10-17 09:12
+
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def split_collections(apps, schema_editor):
+    """
+    Explodes every SpatialData GeometryCollection into SpatialFeature rows.
+    Batched ingests stored several collections per file; their features are
+    folded into the file's first SpatialData row and the extra rows removed.
+    """
+    SpatialData = apps.get_model("gis_database", "SpatialData")
+    SpatialFeature = apps.get_model("gis_database", "SpatialFeature")
+
+    targets = {}
+    next_index = {}
+
+    for record in SpatialData.objects.order_by("source_file_id", "id").iterator():
+        key = record.source_file_id or f"record-{record.pk}"
+        target = targets.setdefault(key, record)
+        start = next_index.get(target.pk, 0)
+
+        properties = record.properties or {}
+        if isinstance(properties, dict):
+            properties = properties.get("features", properties)
+
+        features = []
+        for i, geom in enumerate(record.geometry):
+            props = {}
+            if isinstance(properties, list) and i < len(properties):
+                props = properties[i]
+            elif isinstance(properties, dict):
+                props = properties
+
+            features.append(
+                SpatialFeature(
+                    spatial_data_id=target.pk,
+                    project_id=record.project_id,
+                    feature_index=start + i,
+                    geometry=geom,
+                    properties=props or {},
+                )
+            )
+
+        SpatialFeature.objects.bulk_create(features, batch_size=1000)
+        next_index[target.pk] = start + len(features)
+
+        if target.pk != record.pk:
+            SpatialData.objects.filter(pk=record.pk).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gis_database', '0012_file_size'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpatialFeature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feature_index', models.PositiveIntegerField()),
+                ('geometry', django.contrib.gis.db.models.fields.GeometryField(srid=4326)),
+                ('properties', models.JSONField(default=dict)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='gis_database.project')),
+                ('spatial_data', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='features', to='gis_database.spatialdata')),
+            ],
+            options={
+                'ordering': ['spatial_data', 'feature_index'],
+                'constraints': [models.UniqueConstraint(fields=('spatial_data', 'feature_index'), name='unique_feature_index_per_spatial_data')],
+            },
+        ),
+        migrations.RunPython(split_collections, migrations.RunPython.noop),
+    ]
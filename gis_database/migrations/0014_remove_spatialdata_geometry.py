@@ -0,0 +1,25 @@
+# Generated by Django 6.0.1 on 2026-10-17 09:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gis_database', '0013_spatialfeature'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='spatialdata',
+            name='gis_databas_geometr_b19c79_idx',
+        ),
+        migrations.RemoveField(
+            model_name='spatialdata',
+            name='geometry',
+        ),
+        migrations.RemoveField(
+            model_name='spatialdata',
+            name='properties',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-17 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gis_database', '0015_ingestionjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='spatialdata',
+            name='layer_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
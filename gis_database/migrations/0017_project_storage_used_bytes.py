@@ -0,0 +1,35 @@
+# Generated by Django 6.0.1 on 2026-10-17 11:20
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def populate_storage_used(apps, schema_editor):
+    Project = apps.get_model("gis_database", "Project")
+    File = apps.get_model("gis_database", "File")
+
+    totals = (
+        File.objects.filter(project=OuterRef("pk"))
+        .order_by()
+        .values("project")
+        .annotate(total=Sum("size"))
+        .values("total")
+    )
+    Project.objects.update(storage_used_bytes=Coalesce(Subquery(totals), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gis_database', '0016_spatialdata_layer_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='storage_used_bytes',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_storage_used, migrations.RunPython.noop),
+    ]
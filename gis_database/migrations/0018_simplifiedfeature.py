@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-17 14:05
+
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gis_database', '0017_project_storage_used_bytes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimplifiedFeature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('level', models.PositiveSmallIntegerField()),
+                ('geometry', django.contrib.gis.db.models.fields.GeometryField(spatial_index=False, srid=4326)),
+                ('feature', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='simplified', to='gis_database.spatialfeature')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('feature', 'level'), name='unique_level_per_feature')],
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 6.0.1 on 2026-10-17 15:30
+
+from django.contrib.gis.db.models import Extent
+from django.db import migrations, models
+from django.db.models import Count, Func
+
+
+def populate_summaries(apps, schema_editor):
+    """Counts, extents and geometry types of already ingested layers"""
+    SpatialData = apps.get_model("gis_database", "SpatialData")
+    SpatialFeature = apps.get_model("gis_database", "SpatialFeature")
+
+    for record in SpatialData.objects.iterator():
+        features = SpatialFeature.objects.filter(spatial_data=record)
+        summary = features.aggregate(count=Count("pk"), extent=Extent("geometry"))
+
+        record.feature_count = summary["count"]
+        record.extent = list(summary["extent"]) if summary["extent"] else None
+        record.geometry_types = sorted(
+            features.annotate(
+                geometry_type=Func(
+                    "geometry", function="GeometryType", output_field=models.CharField()
+                )
+            )
+            .order_by()
+            .values_list("geometry_type", flat=True)
+            .distinct()
+        )
+        record.save(update_fields=["feature_count", "extent", "geometry_types"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gis_database', '0018_simplifiedfeature'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='spatialdata',
+            name='attribute_schema',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='spatialdata',
+            name='extent',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='spatialdata',
+            name='feature_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='spatialdata',
+            name='geometry_types',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='spatialdata',
+            name='source_crs',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
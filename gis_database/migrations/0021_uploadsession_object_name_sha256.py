@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-17 16:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gis_database', '0020_uploadsession'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadsession',
+            name='object_name',
+            field=models.CharField(blank=True, max_length=500),
+        ),
+        migrations.AddField(
+            model_name='uploadsession',
+            name='sha256',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
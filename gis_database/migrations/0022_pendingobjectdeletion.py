@@ -0,0 +1,29 @@
+# Generated by Django 6.0.1 on 2026-10-17 18:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gis_database', '0021_uploadsession_object_name_sha256'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingObjectDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=1024)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['available_at'],
+                'indexes': [models.Index(fields=['available_at'], name='gis_databas_availab_44b340_idx')],
+            },
+        ),
+    ]
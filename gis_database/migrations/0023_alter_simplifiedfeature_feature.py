@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-17 21:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gis_database', '0022_pendingobjectdeletion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='simplifiedfeature',
+            name='feature',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.DB_CASCADE, related_name='simplified', to='gis_database.spatialfeature'),
+        ),
+    ]
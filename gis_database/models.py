@@ -1,7 +1,9 @@
 import os
+import uuid
 
 from django.db import models
-from django.db.models import UniqueConstraint
+from django.db.models import CharField, Count, Func, Q, UniqueConstraint
+from django.db.models.functions import Coalesce
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
 from django.core.exceptions import ValidationError
@@ -9,6 +11,8 @@ from django.conf import settings
 from django.utils import timezone
 from django.contrib.auth.models import User
 from django.contrib.gis.db import models as geomodels
+from django.contrib.gis.db.models import Extent
+from django.contrib.gis.geos import Polygon
 
 
 def file_upload_path(instance, filename):
@@ -19,6 +23,14 @@ def file_upload_path(instance, filename):
     return f"uploads/{user_id}/{project_name}/{file_folder}/{base_name}_v{instance.version}{ext}"
 
 
+class ProjectQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """Live projects the user owns or is a member of"""
+        return self.filter(
+            Q(owner=user) | Q(membership__user=user), is_deleted=False
+        ).distinct()
+
+
 class Project(models.Model):
     name = models.CharField(max_length=255)
     description = models.CharField(max_length=500, null=True, blank=True)
@@ -35,6 +47,11 @@ class Project(models.Model):
     is_deleted = models.BooleanField(default=False)
     is_private = models.BooleanField(default=False)
 
+    # Running total of File.size, kept by signals (see reconcile_storage_usage)
+    storage_used_bytes = models.BigIntegerField(default=0)
+
+    objects = ProjectQuerySet.as_manager()
+
     # ----- Domain Constraints ------
     MAX_STORAGE_MB = 50
 
@@ -51,7 +68,7 @@ class Project(models.Model):
         self.save(update_fields=["is_deleted", "deleted_at"])
 
     def used_storage_bytes(self):
-        return sum(f.file.size for f in self.files.all() if f.file)
+        return self.storage_used_bytes
 
     def has_storage_for(self, new_file_size):
         max_bytes = self.MAX_STORAGE_MB * 1024 * 1024
@@ -65,7 +82,9 @@ class Project(models.Model):
     def can_view(self, user):
         if not self.is_private:
             return True
-        return self.memberships.filter(user=user).exists()
+        if not user.is_authenticated:
+            return False
+        return self.membership.filter(user=user).exists()
 
     def can_edit(self, user):
         role = self.get_user_role(user)
@@ -123,6 +142,7 @@ class File(models.Model):
     is_latest = models.BooleanField(default=False, db_index=True)
     # ----- Domain Constraints ------
     MAX_FILE_SIZE = 100 * 1024 * 1024
+    SPATIAL_EXTENSIONS = [".geojson", ".gpkg", ".kml"]
 
     class Meta:
         ordering = ["-created_at"]
@@ -134,21 +154,30 @@ class File(models.Model):
         ]
 
     def clean(self):
-        if self.file:
+        # Size and quota only matter for new rows; re-saving an existing
+        # version (e.g. toggling is_latest) must not re-check them.
+        if self.file and self._state.adding:
 
-            if self.file.size > self.MAX_FILE_SIZE:
+            if self.size > self.MAX_FILE_SIZE:
                 raise ValidationError(
                     f"File too large. Max size is {self.MAX_FILE_SIZE // (1024 * 1024)} MB."
                 )
-            if self.owner and not self.owner.profile.can_store(self.file.size):
+            if self.owner and not self.owner.profile.can_store(self.size):
                 raise ValidationError("User storage quota exceeded")
 
     def save(self, *args, **kwargs):
-        if self.file:
+        # Only a fresh upload has a local size; asking the storage backend
+        # would be a HEAD request to B2.
+        if self.file and not self.file._committed:
             self.size = self.file.size
         self.full_clean()
         super().save(*args, **kwargs)
 
+    @property
+    def is_spatial(self):
+        extension = os.path.splitext(self.file.name or "")[1].lower()
+        return extension in self.SPATIAL_EXTENSIONS
+
     def get_history(self):
         """Returns all version of this file, newest first"""
         return File.objects.filter(project=self.project, name=self.name).order_by(
@@ -184,19 +213,211 @@ class SpatialData(geomodels.Model):
     source_file = models.ForeignKey(
         File, on_delete=models.CASCADE, null=True, blank=True
     )
+    layer_name = models.CharField(max_length=255, blank=True)
 
-    geometry = geomodels.GeometryCollectionField(srid=4326)
-    properties = models.JSONField(default=dict)
+    # Summary stored at ingestion so metadata and bounds never read geometry
+    feature_count = models.PositiveIntegerField(default=0)
+    extent = models.JSONField(null=True, blank=True)  # [minx, miny, maxx, maxy]
+    geometry_types = models.JSONField(default=list, blank=True)
+    attribute_schema = models.JSONField(default=dict, blank=True)  # name -> dtype
+    source_crs = models.CharField(max_length=255, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    def refresh_summary(self):
+        """Recomputes feature_count, extent and geometry_types from features"""
+        summary = self.features.aggregate(count=Count("pk"), extent=Extent("geometry"))
+        self.feature_count = summary["count"]
+        self.extent = list(summary["extent"]) if summary["extent"] else None
+        self.geometry_types = sorted(
+            self.features.annotate(
+                geometry_type=Func(
+                    "geometry", function="GeometryType", output_field=CharField()
+                )
+            )
+            .order_by()
+            .values_list("geometry_type", flat=True)
+            .distinct()
+        )
+        self.save(update_fields=["feature_count", "extent", "geometry_types"])
+
+    def __str__(self):
+        if self.layer_name:
+            return f"Spatial Data for {self.source_file.name} ({self.layer_name})"
+        return f"Spatial Data for {self.source_file.name}"
+
+
+class SpatialFeatureQuerySet(geomodels.QuerySet):
+    def in_bbox(self, minx, miny, maxx, maxy):
+        """Features whose bounding box overlaps the WGS84 bbox (index-only test)"""
+        return self.filter(
+            geometry__bboverlaps=Polygon.from_bbox((minx, miny, maxx, maxy))
+        )
+
+    def intersecting(self, geometry):
+        return self.filter(geometry__intersects=geometry)
+
+    def at_level(self, level):
+        """
+        Annotates `display_geometry`: the SimplifiedFeature stored for
+        `level`, falling back to the full geometry (always, if level is None).
+        """
+        if level is None:
+            return self.annotate(display_geometry=models.F("geometry"))
+
+        simplified = SimplifiedFeature.objects.filter(
+            feature=models.OuterRef("pk"), level=level
+        ).values("geometry")[:1]
+        return self.annotate(
+            display_geometry=Coalesce(models.Subquery(simplified), "geometry")
+        )
+
+
+class SpatialFeature(geomodels.Model):
+    """One feature of an ingested file; geometry carries a GiST index."""
+
+    spatial_data = models.ForeignKey(
+        SpatialData, on_delete=models.CASCADE, related_name="features"
+    )
+    project = models.ForeignKey(Project, on_delete=models.CASCADE)
+    feature_index = models.PositiveIntegerField()
+
+    geometry = geomodels.GeometryField(srid=4326, spatial_index=True)
+    properties = models.JSONField(default=dict)
+
+    objects = SpatialFeatureQuerySet.as_manager()
+
     class Meta:
-        indexes = [
-            geomodels.Index(fields=["geometry"]),
+        ordering = ["spatial_data", "feature_index"]
+        constraints = [
+            UniqueConstraint(
+                fields=["spatial_data", "feature_index"],
+                name="unique_feature_index_per_spatial_data",
+            )
         ]
 
     def __str__(self):
-        return f"Spatial Data for {self.source_file.name}"
+        return f"Feature {self.feature_index} of {self.spatial_data_id}"
+
+
+class SimplifiedFeature(geomodels.Model):
+    """
+    A SpatialFeature's geometry simplified for one zoom band (level 1 is the
+    coarsest). Only stored when simplification actually drops vertices;
+    readers fall back to the full-resolution geometry otherwise.
+    """
+
+    # Cascaded by PostgreSQL, so SpatialFeature keeps its fast delete: removing
+    # a layer never loads its feature ids into Python
+    feature = models.ForeignKey(
+        SpatialFeature, on_delete=models.DB_CASCADE, related_name="simplified"
+    )
+    level = models.PositiveSmallIntegerField()
+    geometry = geomodels.GeometryField(srid=4326, spatial_index=False)
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["feature", "level"],
+                name="unique_level_per_feature",
+            )
+        ]
+
+    def __str__(self):
+        return f"Level {self.level} of feature {self.feature_id}"
+
+
+class IngestionJob(models.Model):
+    """Queued ingestion of a spatial File, drained by run_ingestion_worker"""
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    file = models.ForeignKey(
+        File, on_delete=models.CASCADE, related_name="ingestion_jobs"
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"Ingest {self.file} ({self.status})"
+
+
+class UploadSession(models.Model):
+    """
+    A resumable chunked upload. Chunks are appended to a staging file in
+    order; the File is only created in storage once the upload completes.
+    With `object_name` set, the client instead PUTs the whole file straight
+    to object storage through a presigned URL.
+    """
+
+    STATUS_CHOICES = [
+        ("open", "Open"),
+        ("complete", "Complete"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="upload_sessions"
+    )
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="upload_sessions"
+    )
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    offset = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="open")
+    file = models.ForeignKey(File, on_delete=models.SET_NULL, null=True, blank=True)
+
+    # Presigned uploads go straight to object storage under this name
+    object_name = models.CharField(max_length=500, blank=True)
+    # SHA-256 declared by the client, checked on completion if given
+    sha256 = models.CharField(max_length=64, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def staging_path(self):
+        return os.path.join(settings.UPLOAD_STAGING_DIR, str(self.id))
+
+    def __str__(self):
+        return f"Upload {self.filename} ({self.offset}/{self.size})"
+
+
+class PendingObjectDeletion(models.Model):
+    """
+    Storage object whose File row is gone, deleted in batches by
+    run_storage_cleanup_worker instead of inside the request.
+    """
+
+    name = models.CharField(max_length=1024)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Failed deletions are retried with backoff from this time on
+    available_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["available_at"]
+        indexes = [models.Index(fields=["available_at"])]
+
+    def __str__(self):
+        return self.name
 
 
 @receiver(post_delete, sender=File)
@@ -204,14 +425,7 @@ def cleanup_backblaze_on_delete(sender, instance, **kwargs):
     """
     Triggers whenever a File record is deleted from the DB.
     Works for individual file deletes AND project-level cascading deletes.
+    The object is only queued; it commits or rolls back with the delete.
     """
     if instance.file and instance.file.name:
-        storage = instance.file.storage
-        file_key = instance.file.name
-
-        try:
-            if storage.exists(file_key):
-                storage.delete(file_key)
-                print(f"B2: Successfully deleted cloud file: {file_key}")
-        except Exception as e:
-            print(f"B2: Failed to delete cloud file {file_key}. Error: {e}")
+        PendingObjectDeletion.objects.create(name=instance.file.name)
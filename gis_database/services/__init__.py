@@ -1 +1,12 @@
-from .process_spatial_file import process_spatial_file
\ No newline at end of file
+# Ingestion pulls in geopandas/numpy/shapely/GDAL. Keep them out of web
+# workers and unrelated manage.py commands: the service is only imported
+# when it is first used.
+
+
+def __getattr__(name):
+    if name == "process_spatial_file":
+        from .process_spatial_file import process_spatial_file
+
+        globals()[name] = process_spatial_file
+        return process_spatial_file
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
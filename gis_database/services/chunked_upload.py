@@ -0,0 +1,146 @@
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File as DjangoFile
+from django.db import transaction
+
+from ..models import File, UploadSession
+from .file_versions import create_file_version
+
+READ_SIZE = 1024 * 1024
+
+
+class UploadOffsetMismatch(Exception):
+    """The chunk does not start where the staged upload ends"""
+
+    def __init__(self, expected):
+        super().__init__(f"Chunk must start at offset {expected}")
+        self.expected = expected
+
+
+class StagingLost(Exception):
+    """The staged bytes are gone (e.g. the server was redeployed)"""
+
+    def __init__(self):
+        super().__init__("Staged upload was lost; start the upload again")
+
+
+def staged_hash(staged):
+    """SHA-256 of a staged file, read once from the start"""
+    hasher = hashlib.sha256()
+    for block in iter(lambda: staged.read(READ_SIZE), b""):
+        hasher.update(block)
+    staged.seek(0)
+    return hasher.hexdigest()
+
+
+def start_upload(project, owner, filename, size):
+    if size > File.MAX_FILE_SIZE:
+        raise ValueError(
+            f"File too large. Max size is {File.MAX_FILE_SIZE // (1024 * 1024)} MB."
+        )
+    if not owner.profile.can_store(size):
+        raise ValueError("User storage quota exceeded")
+
+    os.makedirs(settings.UPLOAD_STAGING_DIR, exist_ok=True)
+    session = UploadSession.objects.create(
+        project=project, owner=owner, filename=os.path.basename(filename), size=size
+    )
+    open(session.staging_path, "wb").close()
+    return session
+
+
+def append_chunk(session_id, offset, stream, length):
+    """
+    Appends `length` bytes read from `stream` at `offset`. The session row
+    stays locked while writing so concurrent PUTs of the same upload are
+    serialized.
+    """
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session_id)
+
+        if session.status != "open":
+            raise ValueError("Upload already completed")
+        if offset != session.offset:
+            raise UploadOffsetMismatch(session.offset)
+        if length > settings.UPLOAD_CHUNK_MAX_BYTES:
+            raise ValueError(
+                f"Chunks are limited to {settings.UPLOAD_CHUNK_MAX_BYTES} bytes"
+            )
+        if offset + length > session.size:
+            raise ValueError("Chunk goes past the declared upload size")
+
+        written = 0
+        try:
+            staged = open(session.staging_path, "r+b")
+        except FileNotFoundError:
+            raise StagingLost()
+        with staged:
+            staged.seek(offset)
+            staged.truncate()
+            while written < length:
+                block = stream.read(min(READ_SIZE, length - written))
+                if not block:
+                    break
+                staged.write(block)
+                written += len(block)
+
+        if written != length:
+            # Client disconnected mid-chunk; drop the partial bytes
+            with open(session.staging_path, "r+b") as staged:
+                staged.truncate(offset)
+            raise ValueError("Chunk body shorter than Content-Length")
+
+        session.offset = offset + written
+        session.save(update_fields=["offset", "updated_at"])
+
+    return session
+
+
+def complete_upload(session_id):
+    """
+    Moves a fully staged upload into storage as a new file version. The
+    SHA-256 is computed here in one pass, so chunks may land on any web
+    worker. Returns (file, created) like create_file_version.
+    """
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session_id)
+
+        if session.status != "open":
+            raise ValueError("Upload already completed")
+        if session.offset != session.size:
+            raise ValueError(
+                f"Upload incomplete: {session.offset} of {session.size} bytes"
+            )
+
+        try:
+            staged = open(session.staging_path, "rb")
+        except FileNotFoundError:
+            raise StagingLost()
+        with staged:
+            try:
+                file, created = create_file_version(
+                    session.project,
+                    session.owner,
+                    DjangoFile(staged, name=session.filename),
+                    staged_hash(staged),
+                )
+            except ValidationError as e:
+                # e.g. quota used up by other uploads since the session started
+                raise ValueError(" ".join(e.messages))
+
+        session.status = "complete"
+        session.file = file
+        session.save(update_fields=["status", "file", "updated_at"])
+
+    discard_staging(session)
+    return file, created
+
+
+def discard_staging(session):
+    try:
+        os.remove(session.staging_path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,128 @@
+import json
+import math
+
+from django.db import connection
+
+from ..models import SpatialData, SpatialFeature
+from .render_cache import get_render_cache
+from .tiles import MAX_ZOOM
+
+# Grid cells per tile side; 4 gives 64 px cells on 256 px tiles
+CELLS_PER_TILE = 4
+# Web Mercator half-width in metres
+MERCATOR_EXTENT = 20037508.342789244
+# Upper bound on tiles one request may cover
+MAX_CLUSTER_TILES = 64
+
+
+def lonlat_to_tile(lon, lat, zoom):
+    """Slippy-map tile containing a WGS84 coordinate, clamped to the grid"""
+    lat = max(min(lat, 85.0511287798), -85.0511287798)
+    n = 2**zoom
+    x = int((lon + 180) / 360 * n)
+    y = int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tiles_for_bbox(zoom, minx, miny, maxx, maxy):
+    x0, y0 = lonlat_to_tile(minx, maxy, zoom)
+    x1, y1 = lonlat_to_tile(maxx, miny, zoom)
+    return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+
+def cluster_tile(file_id, z, x, y):
+    """
+    Grid clusters of a file's point features inside one tile. Cells are
+    aligned to the tile, so neighbouring tiles never share a cluster and
+    each tile can be cached on its own.
+    """
+    cell = 2 * MERCATOR_EXTENT / 2**z / CELLS_PER_TILE
+
+    sql = f"""
+        WITH env AS (
+            SELECT ST_TileEnvelope(%(z)s, %(x)s, %(y)s) AS e
+        ),
+        pts AS (
+            SELECT f.id, f.geometry, ST_Transform(f.geometry, 3857) AS m
+            FROM {SpatialFeature._meta.db_table} f
+            JOIN {SpatialData._meta.db_table} l ON l.id = f.spatial_data_id, env
+            WHERE l.source_file_id = %(file_id)s
+              AND GeometryType(f.geometry) = 'POINT'
+              AND f.geometry && ST_Transform(env.e, 4326)
+        ),
+        cells AS (
+            SELECT
+                pts.id,
+                pts.geometry,
+                floor((ST_X(pts.m) - ST_XMin(env.e)) / %(cell)s) AS cx,
+                floor((ST_Y(pts.m) - ST_YMin(env.e)) / %(cell)s) AS cy
+            FROM pts, env
+        )
+        SELECT
+            count(*),
+            ST_X(ST_Centroid(ST_Collect(geometry))),
+            ST_Y(ST_Centroid(ST_Collect(geometry))),
+            min(id)
+        FROM cells
+        WHERE cx >= 0 AND cx < %(cells)s AND cy >= 0 AND cy < %(cells)s
+        GROUP BY cx, cy
+    """
+    params = {
+        "z": z,
+        "x": x,
+        "y": y,
+        "cell": cell,
+        "cells": CELLS_PER_TILE,
+        "file_id": file_id,
+    }
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            {
+                "count": count,
+                "lon": lon,
+                "lat": lat,
+                # A single point keeps its feature id for a detail lookup
+                "feature_id": feature_id if count == 1 else None,
+            }
+            for count, lon, lat, feature_id in cursor.fetchall()
+        ]
+
+
+def file_clusters(file, zoom, bbox):
+    """
+    Point clusters of a file at `zoom` covering `bbox` (minx, miny, maxx,
+    maxy), as a GeoJSON FeatureCollection. Each tile's clusters are cached
+    under the file's content hash and, since they carry ids of this file's
+    own features, its pk.
+    """
+    zoom = min(max(zoom, 0), MAX_ZOOM)
+    tiles = tiles_for_bbox(zoom, *bbox)
+    if len(tiles) > MAX_CLUSTER_TILES:
+        raise ValueError("bbox covers too many tiles at this zoom")
+
+    cache = get_render_cache()
+    clusters = []
+    for x, y in tiles:
+        detail = f"{file.pk}-{zoom}-{x}-{y}"
+        data = cache.get(file.hash, "clusters", detail)
+        if data is None:
+            tile_clusters = cluster_tile(file.pk, zoom, x, y)
+            payload = json.dumps(tile_clusters).encode()
+            cache.set(file.hash, "clusters", detail, payload)
+        else:
+            tile_clusters = json.loads(data)
+        clusters.extend(tile_clusters)
+
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [c["lon"], c["lat"]]},
+                "properties": {"count": c["count"], "feature_id": c["feature_id"]},
+            }
+            for c in clusters
+        ],
+    }
@@ -0,0 +1,172 @@
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines; locking is best-effort
+    fcntl = None
+
+TMP_PREFIX = ".tmp-"
+LOCK_SUFFIX = ".lock"
+# Seconds before a process rescans a cache directory to pick up what
+# other processes wrote since
+RESCAN_INTERVAL = 300
+# Eviction frees space down to this share of max_bytes, so a full cache
+# isn't rescanned on every following store
+LOW_WATER = 0.9
+
+# directory -> [estimated bytes, monotonic time of the last scan], shared by
+# every DiskCache of this process on that directory
+_usage = {}
+
+
+class DiskCache:
+    """
+    Size-bounded directory of cache entries shared by every worker process.
+    Entries are written to a temp file and renamed into place, so readers
+    never see partial data; reads bump the mtime, and the least recently
+    used entries are removed once the directory grows past `max_bytes`.
+    The size is tracked per process between scans, so a store only walks
+    the directory when the estimate crosses `max_bytes` or goes stale.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def path(self, relpath):
+        return self.directory / relpath
+
+    def lookup(self, relpath):
+        """Path of a cached entry (marking it recently used), or None"""
+        path = self.path(relpath)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def store(self, relpath, chunks):
+        """
+        Writes the byte chunks as an entry and returns its path, or None when
+        the entry alone exceeds `max_bytes`.
+        """
+        path = self.path(relpath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        written = 0
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=TMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                for chunk in chunks:
+                    written += len(chunk)
+                    if written > self.max_bytes:
+                        break
+                    tmp.write(chunk)
+
+            if written > self.max_bytes:
+                Path(tmp_path).unlink(missing_ok=True)
+                return None
+
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        usage = _usage.get(self.directory)
+        if usage is None or time.monotonic() - usage[1] > RESCAN_INTERVAL:
+            self.evict()
+        else:
+            # Overwrites count twice; that only brings the next scan forward
+            usage[0] += written
+            if usage[0] > self.max_bytes:
+                self.evict()
+        return path
+
+    def discard(self, relpath):
+        path = self.path(relpath)
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
+
+    @contextmanager
+    def pinned(self, relpath):
+        """
+        Yields a hard link to an entry that eviction leaves alone, removed on
+        exit; None if the entry is gone. Pins don't count towards the size.
+        """
+        path = self.path(relpath)
+        pin = path.with_name(f"{TMP_PREFIX}pin-{uuid.uuid4().hex}")
+        try:
+            os.link(path, pin)
+        except FileNotFoundError:
+            yield None
+            return
+
+        try:
+            yield pin
+        finally:
+            pin.unlink(missing_ok=True)
+
+    @contextmanager
+    def lock(self, relpath):
+        """
+        Exclusive lock on one entry across processes, so concurrent misses
+        fill it once instead of each worker fetching it. The lock file is
+        removed on release.
+        """
+        if fcntl is None:
+            yield
+            return
+
+        lock_path = self.path(relpath + LOCK_SUFFIX)
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            lock_file = open(lock_path, "a")
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            # The previous holder may have removed the file while we waited;
+            # a lock on an unlinked file excludes nobody, so start over
+            try:
+                if os.path.samestat(os.fstat(lock_file.fileno()), os.stat(lock_path)):
+                    break
+            except FileNotFoundError:
+                pass
+            lock_file.close()
+
+        try:
+            yield
+        finally:
+            lock_path.unlink(missing_ok=True)
+            lock_file.close()
+
+    def evict(self):
+        entries = []
+        total = 0
+        for path in self.directory.rglob("*"):
+            if path.name.startswith(TMP_PREFIX) or path.name.endswith(LOCK_SUFFIX):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if not path.is_file():
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total > self.max_bytes:
+            # Oldest first; another process may be evicting the same files,
+            # and readers holding an evicted file open keep reading it (POSIX)
+            for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+                path.unlink(missing_ok=True)
+                total -= size
+                if total <= self.max_bytes * LOW_WATER:
+                    break
+
+        _usage[self.directory] = [total, time.monotonic()]
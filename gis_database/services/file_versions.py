@@ -0,0 +1,53 @@
+import os
+
+from django.db import transaction
+
+from ..models import File, FileActivity
+
+
+def next_version(project, name):
+    """(version, file_folder) the next upload of `name` in the project gets"""
+    latest = project.files.filter(name=name).order_by("-version").first()
+    if latest:
+        return latest.version + 1, latest.file_folder
+    return 1, os.path.splitext(name)[0].replace(" ", "_")
+
+
+def create_file_version(
+    project, owner, uploaded_file, file_hash, name=None, size=None
+):
+    """
+    Stores `uploaded_file` as the next version of `name` in the project and
+    marks it latest. `uploaded_file` may also be the name of an object
+    already in storage, with its `size`. Returns (file, created); content
+    already present in the project is returned as the existing File instead.
+    """
+    name = name or uploaded_file.name
+
+    existing = project.files.filter(hash=file_hash).first()
+    if existing:
+        return existing, False
+
+    with transaction.atomic():
+        version, file_folder = next_version(project, name)
+        project.files.filter(name=name).update(is_latest=False)
+
+        new_file = File.objects.create(
+            project=project,
+            owner=owner,
+            name=name,
+            file_folder=file_folder,
+            file=uploaded_file,
+            hash=file_hash,
+            version=version,
+            is_latest=True,
+            **({"size": size} if size is not None else {}),
+        )
+
+        FileActivity.objects.create(
+            file=new_file,
+            owner=owner,
+            action="new file version created",
+        )
+
+    return new_file, True
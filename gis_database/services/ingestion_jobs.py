@@ -0,0 +1,78 @@
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import IngestionJob
+from .process_spatial_file import process_spatial_file
+from .render_cache import invalidate_render_cache
+from .simplify import build_simplified_features
+
+
+def claim_next_job():
+    """
+    Marks the oldest runnable job as running and returns it, or None.
+    SKIP LOCKED lets several workers claim concurrently without ever
+    handing out the same job twice. Jobs left running longer than
+    INGESTION_JOB_TIMEOUT (a crashed worker) become claimable again, until
+    they reach INGESTION_MAX_ATTEMPTS; then they are marked failed.
+    """
+    now = timezone.now()
+    stale = Q(
+        status="running",
+        started_at__lt=now - timedelta(seconds=settings.INGESTION_JOB_TIMEOUT),
+    )
+    runnable = Q(status="pending") | (
+        stale & Q(attempts__lt=settings.INGESTION_MAX_ATTEMPTS)
+    )
+
+    # A file that keeps killing its worker must not be retried forever
+    IngestionJob.objects.filter(
+        stale, attempts__gte=settings.INGESTION_MAX_ATTEMPTS
+    ).update(
+        status="failed",
+        error="Worker stopped responding on every attempt",
+        finished_at=now,
+    )
+
+    with transaction.atomic():
+        job = (
+            IngestionJob.objects.select_for_update(skip_locked=True)
+            .filter(runnable)
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+
+        job.status = "running"
+        job.attempts += 1
+        job.started_at = timezone.now()
+        job.finished_at = None
+        job.save(update_fields=["status", "attempts", "started_at", "finished_at"])
+
+    return job
+
+
+def run_job(job):
+    try:
+        process_spatial_file(job.file)
+        build_simplified_features(job.file)
+    except Exception:
+        job.error = traceback.format_exc()
+        if job.attempts < settings.INGESTION_MAX_ATTEMPTS:
+            job.status = "pending"
+        else:
+            job.status = "failed"
+    else:
+        job.error = ""
+        job.status = "done"
+        # Features were rebuilt; anything rendered from an earlier run is stale
+        invalidate_render_cache(job.file.hash)
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "error", "finished_at"])
+    return job
@@ -0,0 +1,113 @@
+import io
+import json
+import struct
+
+from django.conf import settings
+from django.contrib.gis.geos import GEOSGeometry
+from django.db import connection
+
+from ..models import SpatialFeature
+
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+PGCOPY_TRAILER = struct.pack("!h", -1)
+
+# struct codes for the integer column types SpatialFeature maps to
+INT_FORMATS = {"bigint": "q", "integer": "i", "smallint": "h"}
+
+
+def pack_int(code, value):
+    """Binary COPY field: int32 byte length followed by the big-endian value"""
+    return struct.pack("!i" + code, struct.calcsize("!" + code), value)
+
+
+class ORMLoader:
+    """Writes features with bulk_create; works on any database backend."""
+
+    def __init__(self, spatial_data):
+        self.spatial_data = spatial_data
+
+    def load(self, start_index, geometries, properties):
+        SpatialFeature.objects.bulk_create(
+            SpatialFeature(
+                spatial_data=self.spatial_data,
+                project_id=self.spatial_data.project_id,
+                feature_index=start_index + i,
+                geometry=GEOSGeometry(memoryview(ewkb)),
+                properties=json.loads(props),
+            )
+            for i, (ewkb, props) in enumerate(zip(geometries, properties))
+        )
+
+
+class CopyLoader:
+    """
+    Streams features into PostGIS with COPY ... FROM STDIN (FORMAT binary).
+    Geometries go over the wire as the EWKB produced by encode_batch and
+    properties as binary jsonb wrapping its JSON text, so no GEOS objects,
+    property dicts or INSERT SQL are built.
+    """
+
+    columns = ["spatial_data", "project", "feature_index", "geometry", "properties"]
+
+    def __init__(self, spatial_data):
+        self.spatial_data = spatial_data
+
+        meta = SpatialFeature._meta
+        fields = [meta.get_field(name) for name in self.columns]
+        self.sql = "COPY {} ({}) FROM STDIN (FORMAT binary)".format(
+            connection.ops.quote_name(meta.db_table),
+            ", ".join(connection.ops.quote_name(f.column) for f in fields),
+        )
+
+        # spatial_data, project and feature_index are integers whose width
+        # depends on the key type; binary COPY rejects a mismatched width.
+        self.int_codes = [INT_FORMATS[f.db_type(connection)] for f in fields[:3]]
+
+    def encode(self, start_index, geometries, properties):
+        spatial_data_code, project_code, index_code = self.int_codes
+        row_prefix = (
+            struct.pack("!h", len(self.columns))
+            + pack_int(spatial_data_code, self.spatial_data.pk)
+            + pack_int(project_code, self.spatial_data.project_id)
+        )
+
+        buffer = io.BytesIO()
+        buffer.write(PGCOPY_HEADER)
+
+        for i, (ewkb, props) in enumerate(zip(geometries, properties)):
+            # jsonb binary format: version byte followed by the JSON text
+            jsonb = b"\x01" + props.encode()
+
+            buffer.write(row_prefix)
+            buffer.write(pack_int(index_code, start_index + i))
+            buffer.write(struct.pack("!i", len(ewkb)))
+            buffer.write(ewkb)
+            buffer.write(struct.pack("!i", len(jsonb)))
+            buffer.write(jsonb)
+
+        buffer.write(PGCOPY_TRAILER)
+        buffer.seek(0)
+        return buffer
+
+    def load(self, start_index, geometries, properties):
+        buffer = self.encode(start_index, geometries, properties)
+
+        with connection.cursor() as cursor:
+            raw = cursor.cursor
+            if hasattr(raw, "copy"):
+                # psycopg 3
+                with raw.copy(self.sql) as copy:
+                    copy.write(buffer.getbuffer())
+            else:
+                # psycopg2
+                raw.copy_expert(self.sql, buffer)
+
+
+def get_loader(spatial_data):
+    """
+    Picks the loader configured by SPATIAL_INGEST_LOADER. COPY needs
+    PostgreSQL; any other backend falls back to the ORM loader.
+    """
+    if settings.SPATIAL_INGEST_LOADER == "copy" and connection.vendor == "postgresql":
+        return CopyLoader(spatial_data)
+    return ORMLoader(spatial_data)
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import File, PendingObjectDeletion, UploadSession
+from .object_storage import object_key, supports_presigned
+
+# S3 DeleteObjects accepts at most this many keys per call
+MAX_DELETE_BATCH = 1000
+
+
+def delete_objects(storage, names):
+    """
+    Deletes stored objects, one DeleteObjects call per 1000 on S3-compatible
+    storage. Returns {name: error} for the objects that could not be deleted.
+    """
+    failed = {}
+
+    if not supports_presigned(storage):
+        for name in names:
+            try:
+                storage.delete(name)
+            except Exception as e:
+                failed[name] = str(e)
+        return failed
+
+    client = storage.connection.meta.client
+    for start in range(0, len(names), MAX_DELETE_BATCH):
+        batch = names[start : start + MAX_DELETE_BATCH]
+        keys = {object_key(storage, name): name for name in batch}
+
+        try:
+            response = client.delete_objects(
+                Bucket=storage.bucket_name,
+                Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+            )
+        except Exception as e:
+            failed.update((name, str(e)) for name in batch)
+            continue
+
+        # Quiet mode only reports failures; missing keys count as deleted
+        for error in response.get("Errors", []):
+            failed[keys[error["Key"]]] = f"{error.get('Code')}: {error.get('Message')}"
+
+        # Deleted behind the storage's back; drop any local cached copy
+        if hasattr(storage, "discard_cached"):
+            for name in batch:
+                if name not in failed:
+                    storage.discard_cached(name)
+
+    return failed
+
+
+def names_in_use(names):
+    """
+    Queued names that storage still needs. Names are reused once every
+    version of a file is deleted, so a re-upload may own the object by now.
+    """
+    in_use = set(File.objects.filter(file__in=names).values_list("file", flat=True))
+    in_use.update(
+        UploadSession.objects.filter(
+            object_name__in=names, status="open"
+        ).values_list("object_name", flat=True)
+    )
+    return in_use
+
+
+def drain_deletions(storage=default_storage):
+    """
+    Deletes one batch of queued objects. Rows are claimed with SKIP LOCKED
+    so several workers can drain concurrently; failures are retried with
+    exponential backoff up to STORAGE_DELETE_MAX_ATTEMPTS. Returns
+    (deleted, failed) counts.
+    """
+    batch_size = min(settings.STORAGE_DELETE_BATCH_SIZE, MAX_DELETE_BATCH)
+    now = timezone.now()
+
+    with transaction.atomic():
+        pending = list(
+            PendingObjectDeletion.objects.select_for_update(skip_locked=True)
+            .filter(
+                available_at__lte=now,
+                attempts__lt=settings.STORAGE_DELETE_MAX_ATTEMPTS,
+            )
+            .order_by("available_at")[:batch_size]
+        )
+        if not pending:
+            return 0, 0
+
+        names = {p.name for p in pending}
+        # Re-uploaded under the same name; only the queue rows are dropped
+        names -= names_in_use(names)
+        failed = delete_objects(storage, sorted(names))
+
+        done = [p.pk for p in pending if p.name not in failed]
+        PendingObjectDeletion.objects.filter(pk__in=done).delete()
+
+        retries = [p for p in pending if p.name in failed]
+        for p in retries:
+            p.attempts += 1
+            p.error = failed[p.name]
+            p.available_at = now + timedelta(
+                seconds=settings.STORAGE_DELETE_POLL_INTERVAL * 2**p.attempts
+            )
+        PendingObjectDeletion.objects.bulk_update(
+            retries, ["attempts", "error", "available_at"]
+        )
+
+    return len(done), len(retries)
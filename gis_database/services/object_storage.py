@@ -0,0 +1,158 @@
+import base64
+from collections import deque
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+from django.core.files.storage import default_storage
+
+READ_SIZE = 1024 * 1024
+
+
+def supports_presigned(storage=default_storage):
+    """True for S3-compatible storages (Backblaze B2, MinIO) that can presign"""
+    return hasattr(storage, "bucket_name") and hasattr(storage, "connection")
+
+
+def object_key(storage, name):
+    """Bucket key of a storage name, including the storage's location prefix"""
+    return storage._normalize_name(name)
+
+
+def presigned_put(storage, name, size, expires, sha256):
+    """
+    Presigned PUT URL for `name` and the headers the client must send with
+    it. The signature covers the content length and SHA-256 checksum, so
+    storage rejects a body of another size or content.
+    """
+    checksum = base64.b64encode(bytes.fromhex(sha256)).decode()
+    params = {
+        "Bucket": storage.bucket_name,
+        "Key": object_key(storage, name),
+        "ContentLength": size,
+        "ChecksumSHA256": checksum,
+    }
+    headers = {"Content-Length": str(size), "x-amz-checksum-sha256": checksum}
+
+    acl = getattr(storage, "default_acl", None)
+    if acl:
+        params["ACL"] = acl
+        headers["x-amz-acl"] = acl
+
+    url = storage.connection.meta.client.generate_presigned_url(
+        "put_object", Params=params, ExpiresIn=expires, HttpMethod="PUT"
+    )
+    return url, headers
+
+
+def open_stream(storage, name, start=0, end=None):
+    """
+    Readable binary stream of a stored object, optionally of the byte range
+    start..end (inclusive). Uncached S3 objects are read straight off the
+    GET response body, where storage.open() would first download the whole
+    object to a temp file.
+    """
+    # A read-through cached storage serves (and seeks) its local copy
+    if supports_presigned(storage) and not hasattr(storage, "read_cache"):
+        params = {}
+        if start or end is not None:
+            params["Range"] = f"bytes={start}-{'' if end is None else end}"
+        obj = storage.bucket.Object(object_key(storage, name))
+        return closing(obj.get(**params)["Body"])
+
+    stream = storage.open(name, "rb")
+    if start:
+        stream.seek(start)
+    return stream
+
+
+def iter_stored(storage, name, chunk_size=READ_SIZE, start=0, end=None):
+    """Yields a stored object's bytes (or the range start..end) in chunks"""
+    remaining = None if end is None else end - start + 1
+    with open_stream(storage, name, start, end) as stream:
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            chunk = stream.read(size)
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+def presigned_get(storage, name, expires, filename=None):
+    """Presigned GET URL of a stored object, optionally as a named attachment"""
+    params = {"Bucket": storage.bucket_name, "Key": object_key(storage, name)}
+    if filename:
+        params["ResponseContentDisposition"] = f'attachment; filename="{filename}"'
+    return storage.connection.meta.client.generate_presigned_url(
+        "get_object", Params=params, ExpiresIn=expires
+    )
+
+
+def stored_checksum(storage, name):
+    """
+    (size, SHA-256 hex) of a stored object from a HEAD request; the hash is
+    the checksum storage verified on upload, "" if none was recorded.
+    """
+    head = storage.connection.meta.client.head_object(
+        Bucket=storage.bucket_name,
+        Key=object_key(storage, name),
+        ChecksumMode="ENABLED",
+    )
+    checksum = head.get("ChecksumSHA256", "")
+    return head["ContentLength"], base64.b64decode(checksum).hex()
+
+
+def prefetched(objects, workers, max_bytes):
+    """
+    Yields (key, chunks) for `objects` ((key, storage, name, size) tuples) in
+    order, fetching the next ones in a thread pool while the caller consumes
+    the current one. Prefetched bytes held in memory never exceed
+    `max_bytes`; larger objects are streamed in the caller's thread instead.
+    """
+    objects = iter(objects)
+    pending = deque()
+    buffered = 0
+    exhausted = False
+
+    def fetch(storage, name):
+        return b"".join(iter_stored(storage, name))
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            # Queue look-ahead until the pool or the byte budget is full
+            while not exhausted:
+                running = sum(1 for _, future, _ in pending if future)
+                if running >= workers:
+                    break
+
+                item = next(objects, None)
+                if item is None:
+                    exhausted = True
+                    break
+
+                key, storage, name, size = item
+                if size > max_bytes:
+                    pending.append((item, None, 0))
+                    continue
+                if buffered + size > max_bytes and pending:
+                    # Over budget: fetch this one once earlier ones are written
+                    objects = chain([item], objects)
+                    break
+
+                buffered += size
+                pending.append((item, pool.submit(fetch, storage, name), size))
+
+            if not pending:
+                return
+
+            (key, storage, name, _), future, size = pending.popleft()
+            if future is None:
+                yield key, iter_stored(storage, name)
+            else:
+                yield key, [future.result()]
+                buffered -= size
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,116 @@
+import os
+import re
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from ..models import File, UploadSession, file_upload_path
+from .file_versions import create_file_version, next_version
+from .object_storage import presigned_put, stored_checksum, supports_presigned
+
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def start_presigned_upload(project, owner, filename, size, sha256):
+    """
+    Opens a session whose bytes go straight from the client to object
+    storage. Returns (session, url, headers) for the client's PUT, which
+    must carry the declared SHA-256 as its checksum.
+    """
+    sha256 = sha256.lower()
+    if not supports_presigned(default_storage):
+        raise ValueError("Direct uploads need object storage")
+    if not SHA256_PATTERN.match(sha256):
+        raise ValueError("sha256 (hex) of the file is required")
+    if size > File.MAX_FILE_SIZE:
+        raise ValueError(
+            f"File too large. Max size is {File.MAX_FILE_SIZE // (1024 * 1024)} MB."
+        )
+    if not owner.profile.can_store(size):
+        raise ValueError("User storage quota exceeded")
+
+    filename = os.path.basename(filename)
+
+    # The file's usual folder, but one key per session: with file_overwrite
+    # two open uploads of the same name would otherwise share a key, and the
+    # version is only assigned on completion
+    session_id = uuid.uuid4()
+    version, file_folder = next_version(project, filename)
+    placeholder = File(
+        project=project, owner=owner, file_folder=file_folder, version=version
+    )
+    folder = os.path.dirname(file_upload_path(placeholder, filename))
+    object_name = default_storage.generate_filename(
+        f"{folder}/{session_id.hex}/{filename}"
+    )
+
+    session = UploadSession.objects.create(
+        id=session_id,
+        project=project,
+        owner=owner,
+        filename=filename,
+        size=size,
+        object_name=object_name,
+        sha256=sha256,
+    )
+    url, headers = presigned_put(
+        default_storage,
+        object_name,
+        size,
+        settings.PRESIGNED_UPLOAD_EXPIRES,
+        sha256,
+    )
+    return session, url, headers
+
+
+def finalize_presigned_upload(session_id):
+    """
+    Checks the uploaded object's size and SHA-256 checksum (one HEAD; the
+    bytes are never read here), then records it as a new file version.
+    Returns (file, created) like create_file_version.
+    """
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session_id)
+
+        if session.status != "open":
+            raise ValueError("Upload already completed")
+
+        name = session.object_name
+        if not default_storage.exists(name):
+            raise ValueError("Nothing has been uploaded yet")
+
+        size, file_hash = stored_checksum(default_storage, name)
+        if size != session.size:
+            default_storage.delete(name)
+            raise ValueError(f"Uploaded {size} bytes, expected {session.size}")
+
+        if file_hash != session.sha256:
+            default_storage.delete(name)
+            raise ValueError("Uploaded content does not match its SHA-256")
+
+        try:
+            file, created = create_file_version(
+                session.project,
+                session.owner,
+                name,
+                file_hash,
+                name=session.filename,
+                size=size,
+            )
+        except ValidationError as e:
+            # e.g. quota used up by other uploads since the session started
+            default_storage.delete(name)
+            raise ValueError(" ".join(e.messages))
+        if not created and file.file.name != name:
+            # Same content already stored in the project; drop the duplicate
+            default_storage.delete(name)
+
+        session.status = "complete"
+        session.file = file
+        session.offset = size
+        session.save(update_fields=["status", "file", "offset", "updated_at"])
+
+    return file, created
@@ -1,49 +1,135 @@
 import os
-import json
-import numpy as np
-import geopandas as gpd
-from django.contrib.gis.geos import GEOSGeometry, GeometryCollection
+import tempfile
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
 from ..models import SpatialData
+from .loaders import get_loader
+
+
+@contextmanager
+def local_copy(file_instance):
+    """
+    Yields a local path for the stored file.
+    pyogrio can only page through features of a real file, so remote storages
+    (Backblaze B2) are spooled to a temp file chunk by chunk first, unless
+    the storage keeps a local cache that can pin its copy for the run.
+    """
+    name = file_instance.file.name
+    storage = file_instance.file.storage
+
+    if hasattr(storage, "local_path"):
+        with storage.local_path(name) as path:
+            if path is not None:
+                yield str(path)
+                return
+
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        path = None
+
+    if path:
+        yield path
+        return
+
+    extension = os.path.splitext(name)[1].lower()
+    with tempfile.NamedTemporaryFile(suffix=extension) as tmp:
+        with file_instance.file.open(mode="rb") as f:
+            for chunk in f.chunks():
+                tmp.write(chunk)
+        tmp.flush()
+        yield tmp.name
+
 
-def process_spatial_file(file_instance):
-    valid_extensions = [".geojson", ".gpkg", ".kml"]
-    extension = os.path.splitext(file_instance.file.name)[1].lower()
+def encoded_batches(path, ranges, batch_size, workers):
+    """
+    Yields ((layer, offset), (geometries, properties)) in `ranges` order.
+    With more than one worker, ranges are read and encoded in a process pool;
+    at most two batches per worker are in flight so memory stays bounded.
+    """
+    from .readers import read_encoded_batch
 
-    if extension not in valid_extensions:
+    if workers <= 1:
+        for layer, offset in ranges:
+            yield (layer, offset), read_encoded_batch(path, layer, offset, batch_size)
+        return
+
+    # fork: workers inherit the already loaded GDAL/PROJ state and never touch
+    # the parent's database connection.
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        ranges = iter(ranges)
+        pending = deque()
+
+        def submit_next():
+            item = next(ranges, None)
+            if item is not None:
+                future = pool.submit(read_encoded_batch, path, *item, batch_size)
+                pending.append((item, future))
+
+        for _ in range(workers * 2):
+            submit_next()
+
+        while pending:
+            item, future = pending.popleft()
+            submit_next()
+            yield item, future.result()
+
+
+def process_spatial_file(file_instance, batch_size=None, workers=None):
+    if not file_instance.is_spatial:
         print(f"Skipping non-spatial file: {file_instance.name}")
         return
 
-    # Use 'with' to ensure the file is closed after reading
-    with file_instance.file.open(mode="rb") as f:
-        gdf = gpd.read_file(f)
+    # Heavy GIS stack; only loaded once a job actually runs
+    from .readers import layer_metadata, layer_ranges
+
+    batch_size = batch_size or settings.SPATIAL_INGEST_BATCH_SIZE
+    workers = workers or settings.SPATIAL_INGEST_WORKERS
+    feature_count = 0
 
-    # Convert NaNs to None to avoid JSON errors later
-    gdf = gdf.replace({np.nan: None})
+    # Workers read, reproject and encode; this process owns every DB write.
+    # Peak memory is bounded by the batches in flight, not the file size.
+    with local_copy(file_instance) as path, transaction.atomic():
+        # Re-running a job replaces what an earlier run stored
+        SpatialData.objects.filter(source_file=file_instance).delete()
 
-    # Ensure CRS is WGS84
-    current_epsg = gdf.crs.to_epsg() if gdf.crs else None
-    if current_epsg != 4326:
-        gdf = gdf.to_crs(epsg=4326)
+        layers, ranges = layer_ranges(path, batch_size)
 
-    geoms = []
-    all_properties = []
+        loaders = {}
+        layer_counts = {}
+        for layer in layers:
+            spatial_data = SpatialData.objects.create(
+                project=file_instance.project,
+                source_file=file_instance,
+                layer_name=layer,
+                **layer_metadata(path, layer),
+            )
+            loaders[layer] = get_loader(spatial_data)
+            layer_counts[layer] = 0
 
-    for _, row in gdf.iterrows():
-        # row.geometry.wkb is bytes; .hex() converts it to a clean string
-        if row.geometry:
-            django_geom = GEOSGeometry(row.geometry.wkb.hex(), srid=4326)
-            geoms.append(django_geom)
+        for (layer, _), (geometries, properties) in encoded_batches(
+            path, ranges, batch_size, workers
+        ):
+            loaders[layer].load(layer_counts[layer], geometries, properties)
+            layer_counts[layer] += len(geometries)
+            feature_count += len(geometries)
 
-            prop = row.drop("geometry").to_dict()
-            all_properties.append(json.loads(json.dumps(prop, default=str)))
+            del geometries, properties
 
-    if geoms:
-        collection = GeometryCollection(geoms, srid=4326)
+        for layer, loader in loaders.items():
+            if layer_counts[layer]:
+                loader.spatial_data.refresh_summary()
+            else:
+                loader.spatial_data.delete()
 
-        SpatialData.objects.create(
-            project=file_instance.project,
-            source_file=file_instance,
-            geometry=collection,
-            properties=all_properties,
+    if feature_count:
+        print(
+            f"Successfully ingested {feature_count} features from "
+            f"{len(layers)} layer(s) of {file_instance.name}"
         )
-        print(f"Successfully ingested collection for {file_instance.name}")
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Read side of spatial ingestion: paging features out of a local file and
+encoding them for the loaders. Nothing here touches the database, so these
+functions can run in ProcessPoolExecutor workers.
+"""
+
+import numpy as np
+import pyogrio
+import shapely
+
+
+def layer_ranges(path, batch_size):
+    """
+    Splits every geometry layer of the file into (layer, offset) work items of
+    at most `batch_size` features. Returns (layers, ranges).
+    """
+    layers = [
+        name
+        for name, geometry_type in pyogrio.list_layers(path)
+        if geometry_type is not None
+    ]
+
+    ranges = []
+    for layer in layers:
+        info = pyogrio.read_info(path, layer=layer, force_feature_count=True)
+        ranges += [
+            (layer, offset) for offset in range(0, info["features"], batch_size)
+        ]
+
+    return layers, ranges
+
+
+def layer_metadata(path, layer):
+    """Source CRS and attribute schema (field name -> dtype) of a layer"""
+    info = pyogrio.read_info(path, layer=layer)
+    return {
+        "source_crs": info["crs"] or "",
+        "attribute_schema": {
+            str(name): str(dtype) for name, dtype in zip(info["fields"], info["dtypes"])
+        },
+    }
+
+
+def encode_batch(gdf):
+    """
+    Converts a WGS84 GeoDataFrame batch into (EWKB geometries, properties as
+    JSON text per record). Both columns are converted in one vectorized pass
+    each and the JSON is never parsed back; empty and missing geometries are
+    dropped.
+    """
+    gdf = gdf[~(gdf.geometry.isna() | gdf.geometry.is_empty)]
+
+    geometries = shapely.to_wkb(
+        shapely.set_srid(np.asarray(gdf.geometry.array), 4326), include_srid=True
+    )
+
+    # NaN/NaT become null; anything JSON can't express falls back to str.
+    # One record per line; newlines inside values are escaped, so splitting
+    # on them is safe. Floats keep 15 decimal places, the most pandas
+    # allows (its default is 10).
+    records = gdf.drop(columns=gdf.geometry.name).to_json(
+        orient="records",
+        lines=True,
+        date_format="iso",
+        default_handler=str,
+        double_precision=15,
+    )
+    properties = [line for line in records.split("\n") if line]
+
+    return geometries, properties
+
+
+def read_encoded_batch(path, layer, offset, batch_size):
+    """Reads, reprojects to WGS84 and encodes one range of a layer"""
+    gdf = pyogrio.read_dataframe(
+        path, layer=layer, skip_features=offset, max_features=batch_size
+    )
+
+    if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+        gdf = gdf.to_crs(epsg=4326)
+
+    return encode_batch(gdf)
@@ -0,0 +1,139 @@
+from django.conf import settings
+from django.core.cache import caches
+
+from ..models import SpatialData
+from ..utils import stream_feature_collection
+from .disk_cache import DiskCache
+
+# Bump when a renderer's output changes so old entries are never served
+RENDER_VERSION = 2
+
+
+def render_geojson(layers):
+    return "".join(stream_feature_collection(layers))
+
+
+def render_attributes(layers):
+    return "".join(stream_feature_collection(layers, with_geometry=False))
+
+
+# (format, detail level) -> renderer taking a file's layers and returning text
+RENDERERS = {
+    ("geojson", "full"): render_geojson,
+    ("geojson", "attributes"): render_attributes,
+}
+
+
+class FileSystemRenderCache:
+    """
+    Payloads stored as files under `directory/<hash[:2]>/<hash>/` in a
+    DiskCache: atomic writes, least recently used entries evicted past
+    `max_bytes`.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.disk = DiskCache(directory, max_bytes)
+
+    def entry_dir(self, file_hash):
+        return f"{file_hash[:2]}/{file_hash}"
+
+    def relpath(self, file_hash, fmt, detail):
+        return f"{self.entry_dir(file_hash)}/v{RENDER_VERSION}-{fmt}-{detail}"
+
+    def get(self, file_hash, fmt, detail):
+        path = self.disk.lookup(self.relpath(file_hash, fmt, detail))
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def set(self, file_hash, fmt, detail, data):
+        self.disk.store(self.relpath(file_hash, fmt, detail), [data])
+
+    def invalidate(self, file_hash):
+        self.disk.discard(self.entry_dir(file_hash))
+
+
+class DjangoRenderCache:
+    """
+    Payloads stored in a Django cache alias (e.g. Redis shared by every web
+    worker). Eviction is left to the cache backend's own LRU policy;
+    payloads larger than `max_bytes` are not cached. Keys carry a per-hash
+    generation so invalidation drops every entry of a hash at once.
+    """
+
+    def __init__(self, alias, max_bytes):
+        self.cache = caches[alias]
+        self.max_bytes = max_bytes
+
+    def generation_key(self, file_hash):
+        return f"render:v{RENDER_VERSION}:{file_hash}:generation"
+
+    def key(self, file_hash, fmt, detail):
+        generation = self.cache.get(self.generation_key(file_hash), 0)
+        return f"render:v{RENDER_VERSION}:{file_hash}:{generation}:{fmt}:{detail}"
+
+    def get(self, file_hash, fmt, detail):
+        return self.cache.get(self.key(file_hash, fmt, detail))
+
+    def set(self, file_hash, fmt, detail, data):
+        if len(data) <= self.max_bytes:
+            self.cache.set(self.key(file_hash, fmt, detail), data, timeout=None)
+
+    def invalidate(self, file_hash):
+        key = self.generation_key(file_hash)
+        self.cache.add(key, 0, timeout=None)
+        self.cache.incr(key)
+
+
+class NullRenderCache:
+    def get(self, file_hash, fmt, detail):
+        return None
+
+    def set(self, file_hash, fmt, detail, data):
+        pass
+
+    def invalidate(self, file_hash):
+        pass
+
+
+def get_render_cache():
+    backend = settings.RENDER_CACHE_BACKEND
+    if backend == "filesystem":
+        return FileSystemRenderCache(
+            settings.RENDER_CACHE_DIR, settings.RENDER_CACHE_MAX_BYTES
+        )
+    if backend == "django":
+        return DjangoRenderCache(
+            settings.RENDER_CACHE_ALIAS, settings.RENDER_CACHE_MAX_BYTES
+        )
+    return NullRenderCache()
+
+
+def cached_render(file, fmt, detail="full", cache=None):
+    """
+    Rendered payload (text) of all of a file's layers, or None if the file
+    has not been ingested yet. Keyed by the file's content hash, so every version
+    and project holding the same bytes shares one entry.
+    """
+    renderer = RENDERERS[(fmt, detail)]
+    cache = cache or get_render_cache()
+
+    data = cache.get(file.hash, fmt, detail)
+    if data is not None:
+        return data.decode()
+
+    layers = list(SpatialData.objects.filter(source_file=file).order_by("pk"))
+    if not layers:
+        # Ingestion still pending; don't cache an empty render
+        return None
+
+    text = renderer(layers)
+    cache.set(file.hash, fmt, detail, text.encode())
+    return text
+
+
+def invalidate_render_cache(file_hash):
+    get_render_cache().invalidate(file_hash)
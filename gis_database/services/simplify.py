@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.db import connection, transaction
+
+from ..models import SimplifiedFeature, SpatialData, SpatialFeature
+
+# Web Mercator tiles are 256 px wide and span 360 degrees at zoom 0
+TILE_SIZE = 256
+# Deepest zoom served; requests beyond it get the same geometry
+MAX_ZOOM = 22
+
+
+def level_for_zoom(zoom):
+    """
+    Coarsest simplification level whose tolerance is below one pixel at
+    `zoom`, or None when only the full-resolution geometry will do.
+    """
+    if zoom is None:
+        return None
+
+    # Zoom comes from query strings; 2**zoom must stay small
+    zoom = min(max(zoom, 0), MAX_ZOOM)
+    pixel = 360 / (TILE_SIZE * 2**zoom)
+    for level, tolerance in enumerate(settings.SPATIAL_SIMPLIFY_TOLERANCES, start=1):
+        if tolerance <= pixel:
+            return level
+    return None
+
+
+def build_simplified_features(file_instance):
+    """
+    Stores ST_SimplifyPreserveTopology copies of a file's features, one row
+    per level that actually drops vertices. Runs entirely inside PostGIS.
+    """
+    sql = f"""
+        INSERT INTO {SimplifiedFeature._meta.db_table} (feature_id, level, geometry)
+        SELECT id, %(level)s, simplified
+        FROM (
+            SELECT
+                f.id,
+                f.geometry,
+                ST_SimplifyPreserveTopology(f.geometry, %(tolerance)s) AS simplified
+            FROM {SpatialFeature._meta.db_table} f
+            JOIN {SpatialData._meta.db_table} l ON l.id = f.spatial_data_id
+            WHERE l.source_file_id = %(file_id)s
+              AND GeometryType(f.geometry) NOT IN ('POINT', 'MULTIPOINT')
+        ) s
+        WHERE ST_NPoints(simplified) < ST_NPoints(geometry)
+    """
+
+    stored = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        SimplifiedFeature.objects.filter(
+            feature__spatial_data__source_file=file_instance
+        ).delete()
+
+        for level, tolerance in enumerate(
+            settings.SPATIAL_SIMPLIFY_TOLERANCES, start=1
+        ):
+            cursor.execute(
+                sql,
+                {"level": level, "tolerance": tolerance, "file_id": file_instance.pk},
+            )
+            stored += cursor.rowcount
+
+    print(f"Stored {stored} simplified geometries for {file_instance.name}")
+    return stored
@@ -0,0 +1,80 @@
+from django.db import connection
+
+from ..models import File, SimplifiedFeature, SpatialData, SpatialFeature
+from .simplify import MAX_ZOOM, level_for_zoom
+
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+
+
+def tile_in_range(z, x, y):
+    return 0 <= z <= MAX_ZOOM and 0 <= x < 2**z and 0 <= y < 2**z
+
+
+def render_tile(project_id, z, x, y, source_file_id=None):
+    """
+    Renders one Mapbox Vector Tile of a project's features with ST_AsMVT.
+    Features are picked with the GiST index on their WGS84 geometry
+    (tile envelope plus the render buffer), then clipped and quantized in
+    Web Mercator. Defaults to the latest version of every file. Low zooms
+    draw the simplified geometry stored for the zoom's level, if any.
+    """
+    if source_file_id is not None:
+        file_filter = "l.source_file_id = %(source_file_id)s"
+    else:
+        file_filter = "fi.is_latest"
+
+    level = level_for_zoom(z)
+    if level is not None:
+        geometry = "COALESCE(s.geometry, f.geometry)"
+        simplified_join = (
+            f"LEFT JOIN {SimplifiedFeature._meta.db_table} s "
+            "ON s.feature_id = f.id AND s.level = %(level)s"
+        )
+    else:
+        geometry = "f.geometry"
+        simplified_join = ""
+
+    sql = f"""
+        WITH mvtgeom AS (
+            SELECT
+                f.id,
+                f.properties,
+                ST_AsMVTGeom(
+                    ST_Transform({geometry}, 3857),
+                    ST_TileEnvelope(%(z)s, %(x)s, %(y)s),
+                    %(extent)s,
+                    %(buffer)s,
+                    true
+                ) AS geom
+            FROM {SpatialFeature._meta.db_table} f
+            JOIN {SpatialData._meta.db_table} l ON l.id = f.spatial_data_id
+            JOIN {File._meta.db_table} fi ON fi.id = l.source_file_id
+            {simplified_join}
+            WHERE f.project_id = %(project_id)s
+              AND {file_filter}
+              AND f.geometry && ST_Transform(
+                  ST_TileEnvelope(%(z)s, %(x)s, %(y)s, margin => %(margin)s), 4326
+              )
+        )
+        SELECT ST_AsMVT(mvtgeom.*, 'features', %(extent)s, 'geom', 'id')
+        FROM mvtgeom
+        WHERE geom IS NOT NULL
+    """
+    params = {
+        "z": z,
+        "x": x,
+        "y": y,
+        "extent": TILE_EXTENT,
+        "buffer": TILE_BUFFER,
+        "margin": TILE_BUFFER / TILE_EXTENT,
+        "project_id": project_id,
+        "source_file_id": source_file_id,
+        "level": level,
+    }
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        tile = cursor.fetchone()[0]
+
+    return bytes(tile) if tile else b""
@@ -1,8 +1,9 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.apps import apps
-from . models import File
-from .services import process_spatial_file
+from . models import Project, File, IngestionJob
 
 
 @receiver(post_save, sender="gis_database.Project")
@@ -19,6 +20,40 @@ def add_owner_as_admin(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=File)
 def trigger_ingestion(sender, instance, created, **kwargs):
-    if created:
-        from django.db import transaction
-        transaction.on_commit(lambda: process_spatial_file(instance))
+    """Queues the file for run_ingestion_worker; commits with the File row"""
+    if created and instance.is_spatial:
+        IngestionJob.objects.create(file=instance)
+
+
+def adjust_storage_usage(file, delta):
+    """Applies a File's size to its project's and owner's running totals"""
+    Profile = apps.get_model("accounts", "Profile")
+
+    Project.objects.filter(pk=file.project_id).update(
+        storage_used_bytes=F("storage_used_bytes") + delta
+    )
+    if file.owner_id:
+        Profile.objects.filter(user_id=file.owner_id).update(
+            storage_used_bytes=F("storage_used_bytes") + delta
+        )
+
+
+@receiver(post_save, sender=File)
+def count_file_storage(sender, instance, created, **kwargs):
+    if created and instance.size:
+        adjust_storage_usage(instance, instance.size)
+
+
+@receiver(post_delete, sender=File)
+def uncount_file_storage(sender, instance, **kwargs):
+    if instance.size:
+        adjust_storage_usage(instance, -instance.size)
+
+
+@receiver(post_delete, sender=File)
+def drop_rendered_payloads(sender, instance, **kwargs):
+    """Rendered payloads are shared by hash; drop them with the last copy"""
+    from .services.render_cache import invalidate_render_cache
+
+    if instance.hash and not File.objects.filter(hash=instance.hash).exists():
+        transaction.on_commit(lambda: invalidate_render_cache(instance.hash))
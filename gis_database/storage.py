@@ -0,0 +1,111 @@
+import hashlib
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.files import File
+from storages.backends.s3 import S3Storage
+from storages.utils import clean_name
+
+from .services.disk_cache import DiskCache
+
+READ_SIZE = 1024 * 1024
+
+
+class CachedS3Storage(S3Storage):
+    """
+    S3Storage (Backblaze B2) with a local read-through disk cache shared by
+    every worker on the host. Reads are served from STORAGE_CACHE_DIR after
+    the first fetch. Names get reused (file_overwrite, re-uploads after a
+    delete), so entries are keyed by name and ETag: a HEAD per open tells
+    whether the cached bytes are still the stored ones.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.read_cache = DiskCache(
+            settings.STORAGE_CACHE_DIR, settings.STORAGE_CACHE_MAX_BYTES
+        )
+
+    def entry_dir(self, name):
+        """Cache directory holding every cached ETag of a name"""
+        key = self._normalize_name(clean_name(name))
+        digest = hashlib.sha256(f"{self.bucket_name}/{key}".encode()).hexdigest()
+        return f"{digest[:2]}/{digest}"
+
+    def cache_relpath(self, name, etag):
+        return f"{self.entry_dir(name)}/{etag.strip(chr(34))}"
+
+    def cached_entry(self, name):
+        """
+        Relative path of the object's current bytes in the cache, fetched if
+        missing; None when the object is larger than the whole cache.
+        """
+        obj = self.bucket.Object(self._normalize_name(clean_name(name)))
+        relpath = self.cache_relpath(name, obj.e_tag)
+
+        # Known from the same HEAD; don't download what store() would discard
+        if obj.content_length > self.read_cache.max_bytes:
+            return None
+
+        if self.read_cache.lookup(relpath) is not None:
+            return relpath
+
+        with self.read_cache.lock(relpath):
+            # Another worker may have filled it while we waited
+            if self.read_cache.lookup(relpath) is not None:
+                return relpath
+
+            response = obj.get()
+            # Replaced since the HEAD; file the bytes under what was read
+            relpath = self.cache_relpath(name, response["ETag"])
+            body = response["Body"]
+            try:
+                path = self.read_cache.store(
+                    relpath, iter(lambda: body.read(READ_SIZE), b"")
+                )
+            finally:
+                body.close()
+        return relpath if path is not None else None
+
+    @contextmanager
+    def local_path(self, name):
+        """
+        Local path of the object that stays valid until the block exits, even
+        if the entry is evicted meanwhile; None when it can't be cached.
+        """
+        for _ in range(3):
+            relpath = self.cached_entry(name)
+            if relpath is None:
+                break
+            with self.read_cache.pinned(relpath) as path:
+                if path is not None:
+                    yield path
+                    return
+            # Evicted between the fetch and the pin; fetch again
+        yield None
+
+    def discard_cached(self, name):
+        self.read_cache.discard(self.entry_dir(name))
+
+    def _open(self, name, mode="rb"):
+        if "r" not in mode or "+" in mode:
+            return super()._open(name, mode)
+
+        relpath = self.cached_entry(name)
+        if relpath is not None:
+            try:
+                # The open handle keeps reading even if the entry is evicted
+                return File(open(self.read_cache.path(relpath), mode), name=name)
+            except FileNotFoundError:
+                pass
+        # Larger than the whole cache, or evicted right after the fetch
+        return super()._open(name, mode)
+
+    def _save(self, name, content):
+        name = super()._save(name, content)
+        self.discard_cached(name)
+        return name
+
+    def delete(self, name):
+        super().delete(name)
+        self.discard_cached(name)
@@ -1,3 +1,234 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import Project, File, FileActivity, UploadSession
+from .services.chunked_upload import (
+    StagingLost,
+    UploadOffsetMismatch,
+    append_chunk,
+    complete_upload,
+    start_upload,
+)
+from .services.loaders import PGCOPY_HEADER, PGCOPY_TRAILER, CopyLoader
+
+
+class ImportTimeTests(SimpleTestCase):
+    """Web workers must boot without the GIS/dataframe stack used by ingestion"""
+
+    HEAVY_MODULES = {"geopandas", "pandas", "numpy", "shapely", "pyogrio", "pyproj"}
+
+    def test_django_setup_does_not_import_ingestion_stack(self):
+        code = (
+            "import django; django.setup(); "
+            "from django.urls import get_resolver; get_resolver().url_patterns"
+        )
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": "centralize_gis_db.settings"}
+
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+
+        # -X importtime writes "import time: self | cumulative | module" lines
+        imported = {
+            line.rsplit("|", 1)[-1].strip().split(".")[0]
+            for line in result.stderr.splitlines()
+            if line.startswith("import time:")
+        }
+        self.assertFalse(
+            imported & self.HEAVY_MODULES,
+            f"django.setup() imported {sorted(imported & self.HEAVY_MODULES)}",
+        )
+
+
+class DashboardQueryCountTests(TestCase):
+    """The dashboard must not issue per-project or per-file queries"""
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media_settings = self.settings(MEDIA_ROOT=media_root.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+        self.user = User.objects.create_user("owner", password="secret-pass-123")
+        self.client.force_login(self.user)
+
+    def add_projects(self, count, files_per_project):
+        for _ in range(count):
+            project = Project.objects.create(
+                name=f"project-{Project.objects.count()}", owner=self.user
+            )
+            for version in range(1, files_per_project + 1):
+                file = File.objects.create(
+                    project=project,
+                    owner=self.user,
+                    name="notes.csv",
+                    file=ContentFile(b"id,name\n1,a\n", name="notes.csv"),
+                    hash=f"{project.pk}-{version}",
+                    version=version,
+                    is_latest=version == files_per_project,
+                )
+                FileActivity.objects.create(
+                    file=file, owner=self.user, action="new file uploaded"
+                )
+
+    def dashboard_query_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("gis_database:dashboard"))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_is_independent_of_projects_and_files(self):
+        self.add_projects(1, 1)
+        baseline = self.dashboard_query_count()
+
+        self.add_projects(12, 4)
+        self.assertEqual(self.dashboard_query_count(), baseline)
+
+
+class ChunkedUploadTests(TestCase):
+    """Chunks must be appended strictly in order and hashed once on completion"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        upload_settings = self.settings(
+            MEDIA_ROOT=os.path.join(tmp.name, "media"),
+            UPLOAD_STAGING_DIR=os.path.join(tmp.name, "staging"),
+        )
+        upload_settings.enable()
+        self.addCleanup(upload_settings.disable)
+
+        self.user = User.objects.create_user("owner", password="secret-pass-123")
+        self.project = Project.objects.create(name="uploads", owner=self.user)
+        self.data = b"id,name\n" + b"".join(
+            f"{i},row {i}\n".encode() for i in range(500)
+        )
+
+    def start(self):
+        return start_upload(self.project, self.user, "rows.csv", len(self.data))
+
+    def append(self, session, start, end):
+        chunk = self.data[start:end]
+        return append_chunk(session.pk, start, io.BytesIO(chunk), len(chunk))
+
+    def test_chunks_complete_into_a_file_version(self):
+        session = self.start()
+        self.append(session, 0, 1000)
+        session = self.append(session, 1000, len(self.data))
+        self.assertEqual(session.offset, len(self.data))
+
+        file, created = complete_upload(session.pk)
+
+        self.assertTrue(created)
+        self.assertEqual(file.hash, hashlib.sha256(self.data).hexdigest())
+        with file.file.open("rb") as stored:
+            self.assertEqual(stored.read(), self.data)
+        self.assertFalse(os.path.exists(session.staging_path))
+
+    def test_chunk_at_wrong_offset_reports_expected_offset(self):
+        session = self.start()
+        self.append(session, 0, 1000)
+
+        with self.assertRaises(UploadOffsetMismatch) as raised:
+            self.append(session, 1500, 2000)
+        self.assertEqual(raised.exception.expected, 1000)
+
+        # A chunk that already landed can't be sent twice either
+        with self.assertRaises(UploadOffsetMismatch):
+            self.append(session, 0, 1000)
+
+    def test_short_chunk_body_is_dropped(self):
+        session = self.start()
+        with self.assertRaises(ValueError):
+            append_chunk(session.pk, 0, io.BytesIO(self.data[:10]), 100)
+
+        session.refresh_from_db()
+        self.assertEqual(session.offset, 0)
+        self.assertEqual(os.path.getsize(session.staging_path), 0)
+
+    def test_chunk_past_declared_size_is_rejected(self):
+        session = self.start()
+        with self.assertRaises(ValueError):
+            append_chunk(
+                session.pk, 0, io.BytesIO(self.data + b"x"), len(self.data) + 1
+            )
+
+    def test_incomplete_upload_cannot_complete(self):
+        session = self.start()
+        self.append(session, 0, 1000)
+
+        with self.assertRaises(ValueError):
+            complete_upload(session.pk)
+        self.assertEqual(UploadSession.objects.get(pk=session.pk).status, "open")
+
+    def test_lost_staging_file(self):
+        session = self.start()
+        self.append(session, 0, 1000)
+        os.remove(session.staging_path)
+
+        with self.assertRaises(StagingLost):
+            self.append(session, 1000, 2000)
+
+        session = UploadSession.objects.get(pk=session.pk)
+        session.offset = session.size
+        session.save()
+        with self.assertRaises(StagingLost):
+            complete_upload(session.pk)
+
+
+class CopyLoaderEncodeTests(SimpleTestCase):
+    """The binary COPY stream must match PostgreSQL's wire format exactly"""
+
+    def read_field(self, stream):
+        (length,) = struct.unpack("!i", stream.read(4))
+        return stream.read(length)
+
+    def test_rows_are_encoded_as_binary_copy(self):
+        loader = CopyLoader(SimpleNamespace(pk=7, project_id=3))
+        spatial_data_code, project_code, index_code = loader.int_codes
+        geometries = [b"\x01\x01\x00\x00\x20", b"\x01\x02"]
+        properties = ['{"name": "a"}', '{"name": "\u00e9", "value": 1.5}']
+
+        stream = loader.encode(10, geometries, properties)
+
+        self.assertEqual(stream.read(len(PGCOPY_HEADER)), PGCOPY_HEADER)
+        for i, (ewkb, props) in enumerate(zip(geometries, properties)):
+            self.assertEqual(struct.unpack("!h", stream.read(2)), (5,))
+            self.assertEqual(
+                struct.unpack("!" + spatial_data_code, self.read_field(stream)), (7,)
+            )
+            self.assertEqual(
+                struct.unpack("!" + project_code, self.read_field(stream)), (3,)
+            )
+            self.assertEqual(
+                struct.unpack("!" + index_code, self.read_field(stream)), (10 + i,)
+            )
+            self.assertEqual(self.read_field(stream), ewkb)
+            # jsonb version byte, then the record's JSON text unchanged
+            self.assertEqual(self.read_field(stream), b"\x01" + props.encode())
+        self.assertEqual(stream.read(), PGCOPY_TRAILER)
+
+    def test_empty_batch_is_header_and_trailer(self):
+        loader = CopyLoader(SimpleNamespace(pk=1, project_id=1))
+        stream = loader.encode(0, [], [])
+        self.assertEqual(stream.read(), PGCOPY_HEADER + PGCOPY_TRAILER)
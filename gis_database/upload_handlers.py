@@ -0,0 +1,39 @@
+import hashlib
+
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler,
+)
+
+
+class HashingUploadMixin:
+    """
+    Hashes chunks as they arrive and sets `.sha256` on the UploadedFile, so
+    compute_hash never re-reads the upload.
+    """
+
+    def new_file(self, *args, **kwargs):
+        # Set first: the memory handler raises StopFutureHandlers once active
+        self.hasher = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        passed_on = super().receive_data_chunk(raw_data, start)
+        if passed_on is None:
+            # This handler kept the chunk; a handler passing it on doesn't hash
+            self.hasher.update(raw_data)
+        return passed_on
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        if uploaded_file is not None:
+            uploaded_file.sha256 = self.hasher.hexdigest()
+        return uploaded_file
+
+
+class HashingMemoryFileUploadHandler(HashingUploadMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(HashingUploadMixin, TemporaryFileUploadHandler):
+    pass
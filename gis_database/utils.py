@@ -1,12 +1,19 @@
 import hashlib
 import io
-import json
+import time
 import zipfile
 
 from django.core.files.base import ContentFile
+from django.contrib.gis.db.models.functions import AsGeoJSON
+from django.db.models import TextField, Value
+from django.db.models.functions import Cast
 
 
 def compute_hash(uploaded_file):
+    # Set by the hashing upload handlers while the upload was received
+    if getattr(uploaded_file, "sha256", None):
+        return uploaded_file.sha256
+
     uploaded_file.seek(0)
     hasher = hashlib.sha256()
     for chunk in uploaded_file.chunks():
@@ -15,59 +22,94 @@ def compute_hash(uploaded_file):
     return hasher.hexdigest()
 
 
-import json
+def stream_feature_collection(
+    spatial_records, with_geometry=True, chunk_size=2000, level=None
+):
+    """
+    Yields the features of `spatial_records` (a file's layers, in order) as
+    one GeoJSON FeatureCollection in text chunks. Rows come from a
+    server-side cursor and geometry/properties arrive as JSON text from
+    PostGIS, so nothing is parsed or held beyond one chunk. `level` serves
+    the stored simplification of that level where present.
+    """
+    yield '{"type": "FeatureCollection", "features": ['
+
+    geojson = AsGeoJSON("display_geometry") if with_geometry else Value("null")
+    buffer = []
+    buffered = 0
+    separator = ""
+
+    for spatial_record in spatial_records or []:
+        rows = (
+            spatial_record.features.at_level(level if with_geometry else None)
+            .order_by("feature_index")
+            .annotate(
+                geojson=geojson,
+                properties_json=Cast("properties", TextField()),
+            )
+            .values_list("geojson", "properties_json")
+            .iterator(chunk_size=chunk_size)
+        )
+
+        for geometry, properties in rows:
+            feature = (
+                f'{separator}{{"type": "Feature", "geometry": {geometry or "null"}, '
+                f'"properties": {properties or "{}"}}}'
+            )
+            separator = ", "
+            buffer.append(feature)
+            buffered += len(feature)
+
+            # Hand the server ~64 KB writes instead of one per feature
+            if buffered >= 65536:
+                yield "".join(buffer)
+                buffer = []
+                buffered = 0
+
+    if buffer:
+        yield "".join(buffer)
+
+    yield "]}"
+
 
-def serialize_spatial_data(spatial_record):
+class _ZipSink(io.RawIOBase):
+    """Unseekable sink; makes zipfile emit data descriptors instead of seeking"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_zip(members):
     """
-    Safely serializes a spatial record into a GeoJSON FeatureCollection.
-    Handles NoneType records and missing/malformed properties.
+    Yields a ZIP archive of `members` ((name, iterable of byte chunks) pairs)
+    as it is written. Entries are ZIP64 with data descriptors, so nothing
+    is buffered beyond the chunk being compressed.
     """
-    # 1. Guard against NoneType records
-    if not spatial_record or not hasattr(spatial_record, "geometry"):
-        return {"type": "FeatureCollection", "features": []}
-
-    try:
-        # Use the .geojson property from GeoDjango/PostGIS
-        geojson_geom = json.loads(spatial_record.geometry.geojson)
-    except (AttributeError, ValueError, TypeError):
-        return {"type": "FeatureCollection", "features": []}
-
-    # 2. Safely handle properties (could be a list or a dict)
-    record_properties = spatial_record.properties or {}
-    features = []
-
-    # Case A: Single geometry (Point, LineString, Polygon, etc.)
-    if geojson_geom.get("type") != "GeometryCollection":
-        features.append({
-            "type": "Feature",
-            "geometry": geojson_geom,
-            "properties": record_properties,
-        })
-
-    # Case B: GeometryCollection
-    else:
-        geometries = geojson_geom.get("geometries", [])
-        
-        # FIX: Check if properties is a dict or a list
-        if isinstance(record_properties, dict):
-            # If it's a dict, try to find a "features" key inside
-            prop_list = record_properties.get("features", [])
-        else:
-            # If it's already a list, use it directly
-            prop_list = record_properties
-
-        for i, geom in enumerate(geometries):
-            props = {}
-            # Match the geometry to its corresponding property index
-            if isinstance(prop_list, list) and i < len(prop_list):
-                props = prop_list[i]
-            elif isinstance(prop_list, dict):
-                props = prop_list # Fallback if there's only one dict for many geoms
-
-            features.append({
-                "type": "Feature", 
-                "geometry": geom, 
-                "properties": props
-            })
-
-    return {"type": "FeatureCollection", "features": features}
\ No newline at end of file
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, chunks in members:
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+
+            with archive.open(info, "w", force_zip64=True) as entry:
+                for chunk in chunks:
+                    entry.write(chunk)
+                    if data := sink.drain():
+                        yield data
+
+            if data := sink.drain():
+                yield data
+
+    yield sink.drain()
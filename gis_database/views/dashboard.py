@@ -55,15 +55,21 @@ def get_user_storage_context(request):
 
 @ensure_csrf_cookie
 def dashboard(request):
-    projects = Project.objects.filter(owner=request.user, is_deleted=False).annotate(
-        used_bytes=Sum("files__size")
+    # One query off the denormalized counters, however many projects/files
+    projects = Project.objects.filter(owner=request.user, is_deleted=False).values_list(
+        "name", "storage_used_bytes"
     )
 
-    chart_labels = [p.name for p in projects]
-    chart_data = [round(p.used_storage_bytes() / (1024 * 1024), 2) for p in projects]
+    chart_labels = []
+    chart_data = []
+    for name, used_bytes in projects:
+        chart_labels.append(name)
+        chart_data.append(round(used_bytes / (1024 * 1024), 2))
 
     context = get_user_storage_context(request)
-    file_activities = FileActivity.objects.filter(owner=request.user)
+    file_activities = FileActivity.objects.filter(owner=request.user).select_related(
+        "file__project"
+    )
     context.update(
         {
             "file_activities": file_activities,
@@ -75,37 +81,43 @@ def dashboard(request):
 
 
 def analytics(request):
-    projects = Project.objects.filter(is_deleted=False).prefetch_related(
-        "membership__user"
-    )
-
+    """
+    Members of the user's projects, each with the projects shared with the
+    user (current_projects) and every project they belong to (all_projects).
+    Two queries regardless of project or membership count.
+    """
     context = get_user_storage_context(request)
 
+    shared = (
+        ProjectMembership.objects.filter(
+            project__owner=request.user, project__is_deleted=False
+        )
+        .exclude(user=request.user)
+        .select_related("user__profile", "project")
+        .order_by("user_id", "-project__created_at")
+    )
+
     members_dict = {}
-    members_list = [] 
-
-    for project in projects:
-        members = project.membership.select_related("user").exclude(user=project.owner)
-        for m in members:
-            if m.user.id not in members_dict:
-
-                m.all_projects = [
-                    up.project
-                    for up in ProjectMembership.objects.filter(
-                        user=m.user
-                    ).select_related("project")
-                    if not up.project.is_deleted
-                ]
-                m.current_projects = [project]
-                members_dict[m.user.id] = m
-            else:
-                members_dict[m.user.id].current_projects.append(project)
-
-        members_list = list(members_dict.values())
+    for m in shared:
+        if m.user_id not in members_dict:
+            m.current_projects = []
+            m.all_projects = []
+            members_dict[m.user_id] = m
+        members_dict[m.user_id].current_projects.append(m.project)
+
+    memberships = (
+        ProjectMembership.objects.filter(
+            user_id__in=members_dict, project__is_deleted=False
+        )
+        .select_related("project")
+        .order_by("-project__created_at")
+    )
+    for up in memberships:
+        members_dict[up.user_id].all_projects.append(up.project)
 
     context.update(
         {
-            "members": members_list,
+            "members": list(members_dict.values()),
         }
     )
 
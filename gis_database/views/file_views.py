@@ -108,8 +108,8 @@ def delete_file(request, pk):
             action=f"Permanently deleted all {version_count} version of: {file_name}",
         )
 
-        for f in all_versions:
-            f.delete()
+        # post_delete still fires per version, queueing each stored object
+        all_versions.delete()
 
         return redirect("gis_database:project-details", pk=project.pk)
 
@@ -1,17 +1,21 @@
 import os
-import zipfile
-import json
-from io import BytesIO
 
-from django.http import HttpResponse, Http404
+from django.conf import settings
+from django.http import HttpResponse, Http404, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.db import transaction, IntegrityError
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
 
 
 from ..models import Project, ProjectMembership, File, FileActivity, SpatialData
 from ..forms import CreateProjectForm
-from ..utils import serialize_spatial_data
+from ..services.render_cache import cached_render
+from ..services.simplify import level_for_zoom
+from ..services.tiles import render_tile, tile_in_range
+from ..services.object_storage import prefetched
+from ..utils import stream_feature_collection, stream_zip
 
 
 @transaction.atomic
@@ -53,23 +57,29 @@ def download_project(request, pk):
     if not files.exists():
         raise Http404("No files in this project.")
 
-    zip_buffer = BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w") as zip_file:
-        for pf in files:
-            if pf.file:
-                stored_name = os.path.basename(pf.file.name)
-                base_name, ext = os.path.splitext(stored_name)
+    def download_name(pf):
+        stored_name = os.path.basename(pf.file.name)
+        base_name, ext = os.path.splitext(stored_name)
 
-                if "_v" in base_name:
-                    base_name = base_name.rsplit("_v", 1)[0]
+        if "_v" in base_name:
+            base_name = base_name.rsplit("_v", 1)[0]
 
-                download_name = f"{base_name}{ext}"
+        return f"{base_name}{ext}"
 
-                with pf.file.open("rb") as f:
-                    zip_file.writestr(download_name, f.read())
+    members = prefetched(
+        (
+            (download_name(pf), pf.file.storage, pf.file.name, pf.size)
+            for pf in files
+            if pf.file
+        ),
+        workers=settings.EXPORT_PREFETCH_WORKERS,
+        max_bytes=settings.EXPORT_PREFETCH_MAX_BYTES,
+    )
 
-    zip_buffer.seek(0)
-    response = HttpResponse(zip_buffer, content_type="application/zip")
+    # The next members are fetched in the background while one is compressed
+    response = StreamingHttpResponse(
+        stream_zip(members), content_type="application/zip"
+    )
     response["Content-Disposition"] = f'attachment; filename="{project.name}.zip"'
     return response
 
@@ -134,25 +144,95 @@ def project_detail(request, pk):
 def project_analytics(request, pk):
     project = get_object_or_404(Project, pk=pk, owner=request.user)
 
-    spatial_files = File.objects.filter(project=project, spatialdata__isnull=False)
+    spatial_files = File.objects.filter(
+        project=project, spatialdata__isnull=False
+    ).distinct()
 
     selected_file_id = request.GET.get("file_id")
     if selected_file_id:
-        selected_record = SpatialData.objects.filter(
-            project=project, source_file_id=selected_file_id
-        ).first()
+        selected_file = spatial_files.filter(pk=selected_file_id).first()
     else:
-        selected_record = (
-            SpatialData.objects.filter(project=project).order_by("-created_at").first()
-        )
-
-    geojson_output = serialize_spatial_data(selected_record)
+        selected_file = spatial_files.order_by("-spatialdata__created_at").first()
+
+    # The map streams vector tiles; the page only carries attributes for the
+    # chart and data panel. Both payloads are cached by content hash.
+    geojson_data = None
+    map_config = None
+    layers = []
+    if selected_file:
+        geojson_data = cached_render(selected_file, "geojson", "attributes")
+        layers = list(selected_file.spatialdata_set.order_by("pk"))
+
+        # Bounds come from the stored layer extents, not the geometry
+        extents = [layer.extent for layer in layers if layer.extent]
+        bounds = None
+        if extents:
+            minx, miny, maxx, maxy = zip(*extents)
+            bounds = [[min(miny), min(minx)], [max(maxy), max(maxx)]]
+
+        tile_url = reverse("gis_database:project-tiles", args=[project.pk, 0, 0, 0])
+        map_config = {
+            "tileUrl": tile_url.replace("/0/0/0.mvt", "/{z}/{x}/{y}.mvt")
+            + f"?file_id={selected_file.pk}",
+            "bounds": bounds,
+        }
 
     context = {
         "project": project,
         "spatial_files": spatial_files,
         "selected_file_id": int(selected_file_id) if selected_file_id else None,
-        "geojson_data": json.dumps(geojson_output),
+        "geojson_data": geojson_data or "".join(stream_feature_collection(None)),
+        "map_config": map_config,
+        "layers": layers,
     }
 
     return render(request, "components/analytics/_analysis-layout.html", context)
+
+
+@login_required
+def file_geojson(request, pk, file_id):
+    """
+    Streams all of a file's layers as one GeoJSON FeatureCollection; memory
+    stays flat regardless of the layer size. `zoom` picks the matching
+    simplification level.
+    """
+    project = get_object_or_404(Project.objects.visible_to(request.user), pk=pk)
+
+    layers = SpatialData.objects.filter(project=project, source_file_id=file_id)
+    layers = list(layers.order_by("pk"))
+    if not layers:
+        raise Http404("No spatial data for this file.")
+
+    zoom = request.GET.get("zoom")
+    level = level_for_zoom(int(zoom)) if zoom and zoom.isdigit() else None
+
+    response = StreamingHttpResponse(
+        stream_feature_collection(layers, level=level),
+        content_type="application/geo+json",
+    )
+    response["Content-Disposition"] = f'inline; filename="{file_id}.geojson"'
+    return response
+
+
+@login_required
+def project_tile(request, pk, z, x, y):
+    """
+    Mapbox Vector Tile of a project's features; `file_id` narrows it to one
+    file, otherwise the latest version of every file is drawn.
+    """
+    project = get_object_or_404(Project.objects.visible_to(request.user), pk=pk)
+
+    if not tile_in_range(z, x, y):
+        raise Http404("Tile out of range.")
+
+    file_id = request.GET.get("file_id")
+    if file_id is not None and not file_id.isdigit():
+        raise Http404("Invalid file.")
+
+    tile = render_tile(
+        project.pk, z, x, y, source_file_id=int(file_id) if file_id else None
+    )
+
+    response = HttpResponse(tile, content_type="application/vnd.mapbox-vector-tile")
+    patch_cache_control(response, private=True, max_age=300)
+    return response
@@ -0,0 +1,93 @@
+# Times the members analytics view (gis_database:analytics) on a large team.
+#
+#   python scripts/benchmark_analytics_view.py            # 1k projects, 5k memberships
+#   python scripts/benchmark_analytics_view.py 200 1000   # PROJECTS MEMBERSHIPS
+#
+# Seeds one owner, PROJECTS projects and MEMBERSHIPS memberships spread over
+# a pool of users, renders the view and reports time and query count.
+# Everything is rolled back afterwards.
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "centralize_gis_db.settings")
+
+import django
+
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Profile
+from gis_database.models import Project, ProjectMembership
+from gis_database.views import analytics
+
+
+class Rollback(Exception):
+    pass
+
+
+def seed(project_count, membership_count):
+    owner = User.objects.create_user("benchmark-owner")
+    user_count = max(membership_count // 10, 1)
+
+    users = User.objects.bulk_create(
+        User(username=f"benchmark-member-{i}") for i in range(user_count)
+    )
+    Profile.objects.bulk_create(Profile(user=u) for u in users)
+
+    projects = Project.objects.bulk_create(
+        Project(name=f"benchmark-{i}", owner=owner) for i in range(project_count)
+    )
+
+    # Each project gets consecutive users so no (user, project) pair repeats
+    per_project = -(-membership_count // project_count)
+    memberships = [
+        ProjectMembership(
+            user=users[(p * per_project + k) % user_count],
+            project=project,
+            role="editor",
+            invited_by=owner,
+        )
+        for p, project in enumerate(projects)
+        for k in range(per_project)
+    ][:membership_count]
+    ProjectMembership.objects.bulk_create(memberships, ignore_conflicts=True)
+
+    return owner
+
+
+def main():
+    project_count, membership_count = map(int, sys.argv[1:3] or [1000, 5000])
+
+    try:
+        with transaction.atomic():
+            owner = seed(project_count, membership_count)
+
+            request = RequestFactory().get("/gis-database/analytics/")
+            request.user = owner
+
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = analytics(request)
+                elapsed = time.perf_counter() - started
+
+            print(f"projects:    {project_count:,}")
+            seeded = ProjectMembership.objects.filter(project__owner=owner).count()
+            print(f"memberships: {seeded:,}")
+            print(f"status:      {response.status_code}")
+            print(f"time:        {elapsed * 1000:.0f} ms")
+            print(f"queries:     {len(queries)}")
+
+            raise Rollback
+    except Rollback:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# Compares the COPY and ORM (bulk_create) loaders used by spatial ingestion.
+#
+#   python scripts/benchmark_spatial_loaders.py                 # 10k, 100k, 1M
+#   python scripts/benchmark_spatial_loaders.py 10000 50000
+#
+# Runs against the configured PostGIS database; everything it writes is
+# rolled back at the end of each run.
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import shapely
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "centralize_gis_db.settings")
+
+import django
+
+django.setup()
+
+from django.conf import settings
+from django.db import transaction
+
+from gis_database.models import Project, SpatialData
+from gis_database.services.loaders import CopyLoader, ORMLoader
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+class Rollback(Exception):
+    pass
+
+
+def make_batches(total, batch_size):
+    """Random points around the Philippines, encoded like encode_batch does"""
+    rng = np.random.default_rng(42)
+    for start in range(0, total, batch_size):
+        count = min(batch_size, total - start)
+        points = shapely.points(
+            rng.uniform(116, 127, count), rng.uniform(4, 21, count)
+        )
+        geometries = shapely.to_wkb(shapely.set_srid(points, 4326), include_srid=True)
+        # One JSON text per record, as encode_batch hands them to the loaders
+        properties = [
+            json.dumps(
+                {"id": start + i, "name": f"feature {start + i}", "value": float(v)}
+            )
+            for i, v in enumerate(rng.random(count))
+        ]
+        yield start, geometries, properties
+
+
+def run(loader_class, total, batch_size):
+    batches = list(make_batches(total, batch_size))
+    elapsed = None
+
+    try:
+        with transaction.atomic():
+            project = Project.objects.create(name=f"benchmark-{loader_class.__name__}")
+            spatial_data = SpatialData.objects.create(project=project)
+            loader = loader_class(spatial_data)
+
+            started = time.perf_counter()
+            for start, geometries, properties in batches:
+                loader.load(start, geometries, properties)
+            elapsed = time.perf_counter() - started
+
+            raise Rollback
+    except Rollback:
+        pass
+
+    return elapsed
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    batch_size = settings.SPATIAL_INGEST_BATCH_SIZE
+
+    print(f"batch size: {batch_size}")
+    print(f"{'features':>10}  {'copy':>16}  {'bulk_create':>16}  {'speedup':>7}")
+
+    for total in sizes:
+        copy_time = run(CopyLoader, total, batch_size)
+        orm_time = run(ORMLoader, total, batch_size)
+        print(
+            f"{total:>10,}  "
+            f"{copy_time:>7.2f}s {total / copy_time:>7,.0f}/s  "
+            f"{orm_time:>7.2f}s {total / orm_time:>7,.0f}/s  "
+            f"{orm_time / copy_time:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()